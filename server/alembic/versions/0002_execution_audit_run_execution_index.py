@@ -0,0 +1,34 @@
+"""Add the (run_id, execution_id, created_at) index on execution_audit.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+
+Serves list_execution_audit filtered by run and execution. The index is
+ascending: scanned backwards it yields created_at DESC, rowid DESC, the
+listing order, without a sort step. RunStore._initialize creates the same
+index, so running upgrade() on a database the app already bootstrapped is a
+no-op because of the IF NOT EXISTS guard.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS idx_execution_audit_run_execution
+        ON execution_audit(run_id, execution_id, created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_execution_audit_run_execution")
@@ -1,6 +1,8 @@
 from datetime import datetime, timezone
+from typing import Iterator
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 
 from app.dependencies import execution_service, rollback_service, run_store, scanner_service, scoring_service
 from app.models import (
@@ -18,6 +20,7 @@ from app.models import (
     ScoreRequest,
     ScoreResponse,
 )
+from app.state import RunRecord
 
 
 router = APIRouter()
@@ -77,13 +80,12 @@ def score(request: ScoreRequest) -> ScoreResponse:
     )
 
 
-@router.post("/execute", response_model=ExecuteResponse)
-def execute(request: ExecuteRequest) -> ExecuteResponse:
-    record = run_store.get(request.run_id)
+def _get_scored_run(run_id: str) -> RunRecord:
+    record = run_store.get(run_id)
     if not record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Run '{request.run_id}' was not found.",
+            detail=f"Run '{run_id}' was not found.",
         )
 
     if not record.scores:
@@ -92,7 +94,16 @@ def execute(request: ExecuteRequest) -> ExecuteResponse:
             detail="Run has not been scored. Call /optimizer/score first.",
         )
 
+    return record
+
+
+@router.post("/execute", response_model=ExecuteResponse)
+def execute(request: ExecuteRequest) -> Response:
+    record = _get_scored_run(request.run_id)
+
     result = execution_service.execute(request, record.recommendations, record.scores)
+    if not result.dry_run:
+        scanner_service.invalidate_cache()
     updated = run_store.set_execution(request.run_id, result)
     if not updated:
         raise HTTPException(
@@ -100,7 +111,44 @@ def execute(request: ExecuteRequest) -> ExecuteResponse:
             detail=f"Run '{request.run_id}' was not found.",
         )
 
-    return result
+    # Execution batches can carry thousands of action results. Serialize them
+    # with pydantic-core directly instead of letting FastAPI re-validate the
+    # model against response_model and walk it through jsonable_encoder.
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+
+@router.post("/execute/stream")
+def execute_stream(request: ExecuteRequest) -> StreamingResponse:
+    """Execute a run, streaming one NDJSON line per action result.
+
+    The final line is the ExecuteResponse summary without action_results.
+    The execution is persisted once it ends, including when the client
+    disconnects or an action raises mid-stream; actions that never ran are
+    recorded as skipped.
+    """
+    record = _get_scored_run(request.run_id)
+
+    def persist(response: ExecuteResponse) -> None:
+        if not response.dry_run:
+            scanner_service.invalidate_cache()
+        run_store.set_execution(request.run_id, response)
+
+    def body() -> Iterator[str]:
+        results = execution_service.iter_execute(
+            request, record.recommendations, record.scores, on_finish=persist
+        )
+        try:
+            while True:
+                yield next(results).model_dump_json() + "\n"
+        except StopIteration as done:
+            response: ExecuteResponse = done.value
+        finally:
+            # A no-op once results is exhausted. If the client went away, this
+            # stops the remaining actions and persists what already ran.
+            results.close()
+        yield response.model_dump_json(exclude={"action_results"}) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
 
 
 @router.post("/rollback", response_model=RollbackResponse)
@@ -139,6 +187,7 @@ def rollback(request: RollbackRequest) -> RollbackResponse:
     )
 
     if not request.dry_run:
+        scanner_service.invalidate_cache()
         status_map = {
             RollbackActionStatus.ROLLED_BACK: RollbackStatus.ROLLED_BACK,
             RollbackActionStatus.FAILED: RollbackStatus.FAILED,
@@ -157,27 +206,7 @@ def rollback(request: RollbackRequest) -> RollbackResponse:
 
 @router.get("/runs", response_model=list[RunSummary])
 def list_runs() -> list[RunSummary]:
-    records = run_store.list()
-    response: list[RunSummary] = []
-
-    for record in records:
-        estimated_savings = (
-            record.savings_summary.total_monthly_savings
-            if record.savings_summary is not None
-            else sum(recommendation.estimated_monthly_savings for recommendation in record.recommendations)
-        )
-
-        response.append(
-            RunSummary(
-                run_id=record.run_id,
-                status=record.status,
-                recommendation_count=len(record.recommendations),
-                estimated_monthly_savings=estimated_savings,
-                updated_at=record.updated_at,
-            )
-        )
-
-    return response
+    return run_store.list_summaries()
 
 
 @router.get("/runs/{run_id}", response_model=RunDetails)
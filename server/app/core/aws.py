@@ -0,0 +1,27 @@
+import functools
+from typing import Any
+
+import boto3
+from botocore.config import Config
+
+# Shared by every S3 client. Adaptive retries back off client-side when S3
+# throttles (503 SlowDown) instead of each worker sleeping through its own
+# retry schedule, and the connection pool is sized above the scanner and
+# executor thread pools (16 workers each by default) so threads don't queue
+# for a connection.
+S3_CLIENT_CONFIG = Config(
+    retries={"max_attempts": 10, "mode": "adaptive"},
+    max_pool_connections=50,
+    tcp_keepalive=True,
+)
+
+
+@functools.lru_cache(maxsize=8)
+def get_s3_client(region_name: str | None = None) -> Any:
+    """Return the process-wide S3 client for ``region_name``.
+
+    Creating a client costs tens of milliseconds of endpoint and model
+    loading, and low-level boto3 clients are thread-safe, so every service
+    shares one per region instead of building its own.
+    """
+    return boto3.session.Session().client("s3", region_name=region_name, config=S3_CLIENT_CONFIG)
@@ -1,9 +1,9 @@
 from datetime import datetime, timezone
 from typing import Any
 
-import boto3
 from botocore.exceptions import ClientError
 
+from app.core.aws import get_s3_client
 from app.models import (
     ExecutionActionStatus,
     ExecutionAuditRecord,
@@ -22,7 +22,7 @@ class RollbackService:
     @property
     def s3(self) -> Any:
         if self._s3 is None:
-            self._s3 = boto3.client("s3")
+            self._s3 = get_s3_client()
         return self._s3
 
     REVERSIBLE_ACTIONS = {
@@ -1,11 +1,21 @@
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+import functools
+from operator import attrgetter
+from threading import Event
+from types import MappingProxyType
+from typing import Any, Callable, Generator, Mapping
 import os
 import uuid
 
-import boto3
 from botocore.exceptions import ClientError
 
+from app.core.aws import get_s3_client
+from app.core.cache import TTLCache
 from app.models import (
     ExecuteRequest,
     ExecuteResponse,
@@ -19,15 +29,166 @@ from app.models import (
     RunStatus,
 )
 
+# Rules added by ADD_LIFECYCLE_POLICY. Shared across calls: boto3 only reads
+# them when serializing the request, so they are never mutated.
+_LIFECYCLE_RULES = (
+    {
+        "ID": "aws-cost-optimizer-archive",
+        "Status": "Enabled",
+        "Filter": {"Prefix": ""},
+        "Transitions": [{"Days": 90, "StorageClass": "GLACIER_IR"}],
+    },
+    {
+        "ID": "aws-cost-optimizer-multipart-cleanup",
+        "Status": "Enabled",
+        "Filter": {"Prefix": ""},
+        "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 7},
+    },
+)
+_LIFECYCLE_RULES_BY_ID = {rule["ID"]: rule for rule in _LIFECYCLE_RULES}
+
+# Upper bound on concurrent GetBucketLifecycleConfiguration calls when
+# prefetching existing rules for a batch.
+_LIFECYCLE_PREFETCH_WORKERS = 8
+
+# Repeat dry-run previews of the same run reuse planned outcomes briefly.
+_DRY_RUN_CACHE_SIZE = 128
+_DRY_RUN_CACHE_TTL_SECONDS = 60
+
+_MISSING_SCORE_MESSAGE = "Missing risk score for recommendation."
+_DESTRUCTIVE_BLOCKED_MESSAGE = "Blocked: set ALLOW_DESTRUCTIVE_EXECUTION=true to allow deletes."
+_MISSING_PERMISSIONS_MESSAGE = "Blocked: missing required permissions."
+_DRY_RUN_MESSAGE = "Dry run: validation passed, action would execute."
+_INTERRUPTED_MESSAGE = "Not run: the execution stopped before this action."
+
+# ``permitted`` for every outcome decided before any S3 call. Live results
+# are always permitted, including ones that fail at S3.
+_PLANNED_STATUS_PERMITTED = {
+    ExecutionActionStatus.SKIPPED: True,
+    ExecutionActionStatus.FAILED: False,
+    ExecutionActionStatus.BLOCKED: False,
+    ExecutionActionStatus.DRY_RUN: True,
+}
+
+# Per-type post-change snapshot: a read-only prototype holding the constant
+# "action" entry, plus an accessor for the type's "target".
+_POST_STATE_SPECS: dict[RecommendationType, tuple[Mapping[str, Any], Callable[[Recommendation], Any]]] = {
+    RecommendationType.CHANGE_STORAGE_CLASS: (
+        MappingProxyType({"action": RecommendationType.CHANGE_STORAGE_CLASS.value}),
+        lambda rec: rec.target_storage_class.value if rec.target_storage_class is not None else rec.recommended_action,
+    ),
+    RecommendationType.ADD_LIFECYCLE_POLICY: (
+        MappingProxyType({"action": RecommendationType.ADD_LIFECYCLE_POLICY.value}),
+        attrgetter("recommended_action"),
+    ),
+    RecommendationType.DELETE_INCOMPLETE_UPLOAD: (
+        MappingProxyType({"action": RecommendationType.DELETE_INCOMPLETE_UPLOAD.value}),
+        attrgetter("key"),
+    ),
+    RecommendationType.DELETE_STALE_OBJECT: (
+        MappingProxyType({"action": RecommendationType.DELETE_STALE_OBJECT.value}),
+        attrgetter("key"),
+    ),
+}
+
+_DEFAULT_GRANTED_PERMISSIONS = ",".join(
+    [
+        "s3:GetObject",
+        "s3:PutObject",
+        "s3:GetLifecycleConfiguration",
+        "s3:PutLifecycleConfiguration",
+        "s3:ListBucketMultipartUploads",
+        "s3:AbortMultipartUpload",
+    ]
+)
+
+
+# Env values are re-read on every execute so changes take effect without a
+# restart; caching on the raw string makes the steady state a dict lookup.
+@functools.lru_cache(maxsize=4)
+def _parse_permissions(raw: str) -> frozenset[str]:
+    return frozenset(item.strip() for item in raw.split(",") if item.strip())
+
+
+def _detached_copy(result: ExecutionActionResult, **update: Any) -> ExecutionActionResult:
+    """Copy a result so that it shares no state dicts with the original.
+
+    model_copy is shallow, and cached dry-run results are handed out many times.
+    """
+    return result.model_copy(
+        update={
+            **update,
+            "pre_change_state": copy.deepcopy(result.pre_change_state),
+            "post_change_state": copy.deepcopy(result.post_change_state),
+        }
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_flag(raw: str) -> bool:
+    return raw.lower() == "true"
+
+
+def _executor_workers() -> int:
+    return int(os.getenv("EXECUTOR_WORKERS", "16"))
+
+
+@dataclass(slots=True)
+class _PendingAction:
+    """A validated live action waiting on its S3 call."""
+
+    index: int
+    recommendation: Recommendation
+    required_permissions: tuple[str, ...]
+    pre_state: dict
+    emit: Callable[..., ExecutionActionResult]
+
+    @property
+    def idempotency_key(self) -> tuple:
+        rec = self.recommendation
+        target = rec.target_storage_class or rec.upload_id
+        return (rec.bucket, rec.key, rec.recommendation_type, target)
+
+    @property
+    def lane(self) -> tuple[str, ...]:
+        # Lifecycle rules are bucket-wide; everything else touches one object.
+        rec = self.recommendation
+        if rec.recommendation_type == RecommendationType.ADD_LIFECYCLE_POLICY:
+            return (rec.bucket,)
+        return (rec.bucket, rec.key or "")
+
+
+@dataclass(slots=True)
+class _ExecutionPlan:
+    execution_id: str
+    run_id: str
+    mode: ExecutionMode
+    dry_run: bool
+    results: list[ExecutionActionResult | None] = field(default_factory=list)
+    pending: list[_PendingAction] = field(default_factory=list)
+    lifecycle_rules: dict[str, list[dict] | None] = field(default_factory=dict)
+    # Messages of actions that already succeeded in this execution, keyed by
+    # _PendingAction.idempotency_key, so repeats don't hit S3 again.
+    applied: dict[tuple, str] = field(default_factory=dict)
+    eligible: int = 0
+
+    def lanes(self) -> list[list[_PendingAction]]:
+        """Group pending actions that must run in order; lanes are independent."""
+        lanes: dict[tuple[str, ...], list[_PendingAction]] = {}
+        for action in self.pending:
+            lanes.setdefault(action.lane, []).append(action)
+        return list(lanes.values())
+
 
 class ExecutionService:
     def __init__(self, s3_client: Any = None) -> None:
         self._s3 = s3_client
+        self._dry_run_cache = TTLCache(maxsize=_DRY_RUN_CACHE_SIZE, ttl=_DRY_RUN_CACHE_TTL_SECONDS)
 
     @property
     def s3(self) -> Any:
         if self._s3 is None:
-            self._s3 = boto3.client("s3")
+            self._s3 = get_s3_client()
         return self._s3
 
     REVERSIBLE_ACTIONS = {
@@ -35,17 +196,21 @@ class ExecutionService:
         RecommendationType.ADD_LIFECYCLE_POLICY,
     }
 
+    # Blocked unless ALLOW_DESTRUCTIVE_EXECUTION=true.
+    DESTRUCTIVE_ACTIONS = frozenset({RecommendationType.DELETE_STALE_OBJECT})
+
+    # Tuples so every result for a type shares one immutable sequence.
     REQUIRED_PERMISSIONS = {
-        RecommendationType.CHANGE_STORAGE_CLASS: ["s3:GetObject", "s3:PutObject"],
-        RecommendationType.ADD_LIFECYCLE_POLICY: [
+        RecommendationType.CHANGE_STORAGE_CLASS: ("s3:GetObject", "s3:PutObject"),
+        RecommendationType.ADD_LIFECYCLE_POLICY: (
             "s3:GetLifecycleConfiguration",
             "s3:PutLifecycleConfiguration",
-        ],
-        RecommendationType.DELETE_INCOMPLETE_UPLOAD: [
+        ),
+        RecommendationType.DELETE_INCOMPLETE_UPLOAD: (
             "s3:ListBucketMultipartUploads",
             "s3:AbortMultipartUpload",
-        ],
-        RecommendationType.DELETE_STALE_OBJECT: ["s3:GetObject", "s3:DeleteObject"],
+        ),
+        RecommendationType.DELETE_STALE_OBJECT: ("s3:GetObject", "s3:DeleteObject"),
     }
 
     def execute(
@@ -54,191 +219,376 @@ class ExecutionService:
         recommendations: list[Recommendation],
         scores: list[RiskScore],
     ) -> ExecuteResponse:
-        execution_id = str(uuid.uuid4())
-        effective_mode, dry_run = self._resolve_mode(request)
-        score_by_id = {score.recommendation_id: score for score in scores}
+        plan = self._plan(request, recommendations, scores)
+        lanes = plan.lanes()
+        workers = min(_executor_workers(), len(lanes))
+        if workers > 1:
+            # boto3 clients are thread-safe; each lane still runs in order.
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return self._run_plan(plan, lanes, pool)
+        return self._run_plan(plan, lanes, None)
+
+    def execute_many(
+        self,
+        batch: list[tuple[ExecuteRequest, list[Recommendation], list[RiskScore]]],
+    ) -> list[ExecuteResponse]:
+        """Execute several runs back to back on one shared worker pool.
+
+        Each run is planned only after the previous one finished, so its
+        pre-change snapshots see the earlier runs' changes.
+        """
+        workers = _executor_workers()
+        if workers <= 1:
+            return [self._run_plan(self._plan(*item), None, None) for item in batch]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return [self._run_plan(self._plan(*item), None, pool) for item in batch]
+
+    def iter_execute(
+        self,
+        request: ExecuteRequest,
+        recommendations: list[Recommendation],
+        scores: list[RiskScore],
+        on_finish: Callable[[ExecuteResponse], Any] | None = None,
+    ) -> Generator[ExecutionActionResult, None, ExecuteResponse]:
+        """Yield action results in recommendation order as they complete.
+
+        Live lanes run on the same worker pool as execute(). The generator's
+        return value is the full ExecuteResponse. ``on_finish`` receives that
+        response however the execution ends, including when the consumer
+        closes the generator early or an action raises: actions already
+        started are waited for, and the ones that never ran are reported as
+        SKIPPED, so every S3 change made is in the response.
+        """
+        plan = self._plan(request, recommendations, scores)
+        pending = {action.index: action for action in plan.pending}
+        lanes = plan.lanes()
+        workers = min(_executor_workers(), len(lanes))
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        stop = Event()
+        ready = {index: Event() for index in pending}
+        failures: list[BaseException] = []
+
+        def run_lane(lane: list[_PendingAction]) -> None:
+            try:
+                for action in lane:
+                    if stop.is_set():
+                        return
+                    plan.results[action.index] = self._run_action(action, plan)
+                    ready[action.index].set()
+            except BaseException as exc:
+                failures.append(exc)
+                stop.set()
+            finally:
+                # Never leave the consumer waiting on a lane that stopped.
+                for action in lane:
+                    ready[action.index].set()
 
-        granted_permissions = self._granted_permissions()
-        allow_destructive = os.getenv("ALLOW_DESTRUCTIVE_EXECUTION", "false").lower() == "true"
-
-        action_results: list[ExecutionActionResult] = []
-        eligible = 0
-        executed = 0
-        skipped = 0
-        blocked = 0
-        failed = 0
-
-        for index, recommendation in enumerate(recommendations):
-            if index >= request.max_actions:
-                skipped += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score_by_id.get(recommendation.id),
+        try:
+            if pool is not None:
+                for lane in lanes:
+                    pool.submit(run_lane, lane)
+            for index in range(len(plan.results)):
+                if index in pending:
+                    if pool is None:
+                        plan.results[index] = self._run_action(pending[index], plan)
+                    else:
+                        ready[index].wait()
+                        if failures:
+                            raise failures[0]
+                yield plan.results[index]
+        finally:
+            stop.set()
+            if pool is not None:
+                # Lanes already running finish their current action, so every
+                # change made to S3 is recorded below.
+                pool.shutdown(wait=True, cancel_futures=True)
+            for index, action in pending.items():
+                if plan.results[index] is None:
+                    plan.results[index] = action.emit(
                         status=ExecutionActionStatus.SKIPPED,
-                        message=f"Skipped due to max_actions={request.max_actions} limit.",
+                        message=_INTERRUPTED_MESSAGE,
                         permitted=True,
-                        required_permissions=[],
-                        missing_permissions=[],
-                        simulated=dry_run,
-                        pre_change_state=self._capture_pre_change_state(recommendation),
-                        post_change_state=None,
+                        required_permissions=action.required_permissions,
                     )
-                )
-                continue
+            response = self._finalize(plan)
+            if on_finish is not None:
+                on_finish(response)
+        return response
+
+    async def execute_async(
+        self,
+        request: ExecuteRequest,
+        recommendations: list[Recommendation],
+        scores: list[RiskScore],
+        concurrency: int = 32,
+    ) -> ExecuteResponse:
+        """Same as execute(), but runs independent S3 actions concurrently.
+
+        Actions touching the same object (or the same bucket's lifecycle
+        configuration) share a lane and still run in order; at most
+        ``concurrency`` lanes are in flight at once.
+        """
+        plan = await asyncio.to_thread(self._plan, request, recommendations, scores)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(lane: list[_PendingAction]) -> None:
+            async with semaphore:
+                await asyncio.to_thread(self._run_lane, plan, lane)
+
+        await asyncio.gather(*(run(lane) for lane in plan.lanes()))
+        return self._finalize(plan)
+
+    def _plan(
+        self,
+        request: ExecuteRequest,
+        recommendations: list[Recommendation],
+        scores: list[RiskScore],
+    ) -> _ExecutionPlan:
+        """Resolve every recommendation that doesn't need an S3 call.
+
+        Live actions are left as ``None`` placeholders in ``plan.results`` and
+        queued on ``plan.pending`` for _run_lane to fill in.
+        """
+        # The execution's uuid4 is the only entropy drawn per call. Audit IDs
+        # are its first 64 bits plus the loop index, which keeps them unique
+        # and makes every audit ID traceable to its execution at a glance.
+        execution_uuid = uuid.uuid4()
+        audit_prefix = execution_uuid.hex[:16]
+        effective_mode, dry_run = self._resolve_mode(request)
+        plan = _ExecutionPlan(
+            execution_id=str(execution_uuid),
+            run_id=request.run_id,
+            mode=effective_mode,
+            dry_run=dry_run,
+        )
+        # Nothing to plan: skip the env reads, cache lookup and prefetch.
+        # (max_actions is validated to be at least 1.)
+        if not recommendations:
+            return plan
+        scores_in_order = self._align_scores(recommendations, scores)
+
+        granted_permissions = self._granted_permissions()
+        allow_destructive = _parse_flag(os.getenv("ALLOW_DESTRUCTIVE_EXECUTION", "false"))
+        blocked_types = frozenset() if allow_destructive else self.DESTRUCTIVE_ACTIONS
+        is_eligible = self._mode_predicate(effective_mode)
+
+        # Dry runs touch no external state, so the planned outcomes depend only
+        # on the inputs below. Repeat previews reuse them with fresh IDs.
+        cache_key = None
+        if dry_run:
+            cache_key = (
+                request.run_id,
+                effective_mode,
+                request.max_actions,
+                granted_permissions,
+                allow_destructive,
+                tuple(
+                    (rec.id, None if score is None else (score.risk_level, score.requires_approval, score.safe_to_automate))
+                    for rec, score in zip(recommendations, scores_in_order)
+                ),
+            )
+            cached = self._dry_run_cache.get(cache_key)
+            if cached is not None:
+                plan.eligible, results = cached
+                plan.results = [
+                    _detached_copy(result, audit_id=f"{audit_prefix}-{index:08x}")
+                    for index, result in enumerate(results)
+                ]
+                return plan
+
+        lifecycle_permissions = self.REQUIRED_PERMISSIONS[RecommendationType.ADD_LIFECYCLE_POLICY]
+        if not dry_run and granted_permissions.issuperset(lifecycle_permissions):
+            lifecycle_buckets = {
+                rec.bucket
+                for rec, rec_score in zip(recommendations[: request.max_actions], scores_in_order)
+                if rec.recommendation_type == RecommendationType.ADD_LIFECYCLE_POLICY
+                and rec_score is not None
+                and is_eligible(rec_score)
+            }
+            plan.lifecycle_rules = self._prefetch_lifecycle_rules(lifecycle_buckets)
+
+        # Grants are fixed for the whole call, so each type's gap is computed once.
+        permission_gaps = {
+            rec_type: tuple(permission for permission in required if permission not in granted_permissions)
+            for rec_type, required in self.REQUIRED_PERMISSIONS.items()
+        }
+        max_actions_message = f"Skipped due to max_actions={request.max_actions} limit."
+        mode_message = f"Skipped by mode '{effective_mode.value}' risk policy."
+
+        # Every slot is assigned by index, so the list never grows; live
+        # actions leave their slot as None until _run_lane fills it.
+        results: list[ExecutionActionResult | None] = [None] * len(recommendations)
+        plan.results = results
+        max_actions = request.max_actions
+        # Bound once; the loop below runs per recommendation.
+        make_result = self._result
+        capture_pre = self._capture_pre_change_state
+        capture_post = self._capture_post_change_state
+        required_by_type = self.REQUIRED_PERMISSIONS
+        pending = plan.pending
+        for index, (recommendation, score) in enumerate(
+            zip(recommendations[:max_actions], scores_in_order[:max_actions])
+        ):
+            pre_state = capture_pre(recommendation)
+            emit = functools.partial(
+                make_result,
+                audit_id=f"{audit_prefix}-{index:08x}",
+                recommendation=recommendation,
+                score=score,
+                simulated=dry_run,
+                pre_change_state=pre_state,
+            )
+            required_permissions: tuple[str, ...] = ()
+            missing_permissions: list[str] = []
+            post_state = None
 
-            score = score_by_id.get(recommendation.id)
             if score is None:
-                failed += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=None,
-                        status=ExecutionActionStatus.FAILED,
-                        message="Missing risk score for recommendation.",
-                        permitted=False,
-                        required_permissions=[],
-                        missing_permissions=[],
-                        simulated=dry_run,
-                        pre_change_state=self._capture_pre_change_state(recommendation),
-                        post_change_state=None,
-                    )
-                )
-                continue
-
-            if not self._is_mode_eligible(effective_mode, score):
-                skipped += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score,
-                        status=ExecutionActionStatus.SKIPPED,
-                        message=f"Skipped by mode '{effective_mode.value}' risk policy.",
-                        permitted=True,
-                        required_permissions=[],
-                        missing_permissions=[],
-                        simulated=dry_run,
-                        pre_change_state=self._capture_pre_change_state(recommendation),
-                        post_change_state=None,
-                    )
-                )
-                continue
-
-            eligible += 1
-            required_permissions = self.REQUIRED_PERMISSIONS.get(recommendation.recommendation_type, [])
-            missing_permissions = [
-                permission for permission in required_permissions if permission not in granted_permissions
-            ]
-
-            if recommendation.recommendation_type == RecommendationType.DELETE_STALE_OBJECT and not allow_destructive:
-                blocked += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score,
-                        status=ExecutionActionStatus.BLOCKED,
-                        message="Blocked: set ALLOW_DESTRUCTIVE_EXECUTION=true to allow deletes.",
-                        permitted=False,
-                        required_permissions=required_permissions,
-                        missing_permissions=missing_permissions,
-                        simulated=dry_run,
-                        pre_change_state=self._capture_pre_change_state(recommendation),
-                        post_change_state=None,
-                    )
-                )
-                continue
-
-            if missing_permissions:
-                blocked += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score,
-                        status=ExecutionActionStatus.BLOCKED,
-                        message="Blocked: missing required permissions.",
-                        permitted=False,
-                        required_permissions=required_permissions,
-                        missing_permissions=missing_permissions,
-                        simulated=dry_run,
-                        pre_change_state=self._capture_pre_change_state(recommendation),
-                        post_change_state=None,
-                    )
-                )
-                continue
-
-            if dry_run:
-                executed += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score,
-                        status=ExecutionActionStatus.DRY_RUN,
-                        message="Dry run: validation passed, action would execute.",
-                        permitted=True,
-                        required_permissions=required_permissions,
-                        missing_permissions=[],
-                        simulated=True,
-                        pre_change_state=self._capture_pre_change_state(recommendation),
-                        post_change_state=self._capture_post_change_state(recommendation, simulated=True),
-                    )
-                )
-                continue
-
-            success, message, extra_state = self._execute_action(recommendation)
-            pre_state = {**self._capture_pre_change_state(recommendation), **extra_state}
-            if success:
-                executed += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score,
-                        status=ExecutionActionStatus.EXECUTED,
-                        message=message,
-                        permitted=True,
-                        required_permissions=required_permissions,
-                        missing_permissions=[],
-                        simulated=False,
-                        pre_change_state=pre_state,
-                        post_change_state=self._capture_post_change_state(recommendation, simulated=False),
-                    )
-                )
+                status, message = ExecutionActionStatus.FAILED, _MISSING_SCORE_MESSAGE
+            elif not is_eligible(score):
+                status, message = ExecutionActionStatus.SKIPPED, mode_message
             else:
-                failed += 1
-                action_results.append(
-                    self._result(
-                        audit_id=str(uuid.uuid4()),
-                        recommendation=recommendation,
-                        score=score,
-                        status=ExecutionActionStatus.FAILED,
-                        message=message,
-                        permitted=True,
-                        required_permissions=required_permissions,
-                        missing_permissions=[],
-                        simulated=False,
-                        pre_change_state=pre_state,
-                        post_change_state=None,
+                plan.eligible += 1
+                required_permissions = required_by_type.get(recommendation.recommendation_type, ())
+                permission_gap = permission_gaps.get(recommendation.recommendation_type)
+                if permission_gap:
+                    missing_permissions = list(permission_gap)
+
+                if recommendation.recommendation_type in blocked_types:
+                    status, message = ExecutionActionStatus.BLOCKED, _DESTRUCTIVE_BLOCKED_MESSAGE
+                elif missing_permissions:
+                    status, message = ExecutionActionStatus.BLOCKED, _MISSING_PERMISSIONS_MESSAGE
+                elif dry_run:
+                    status, message = ExecutionActionStatus.DRY_RUN, _DRY_RUN_MESSAGE
+                    post_state = capture_post(recommendation, simulated=True)
+                else:
+                    pending.append(
+                        _PendingAction(
+                            index=index,
+                            recommendation=recommendation,
+                            required_permissions=required_permissions,
+                            pre_state=pre_state,
+                            emit=emit,
+                        )
                     )
-                )
+                    continue
+
+            results[index] = emit(
+                status=status,
+                message=message,
+                permitted=_PLANNED_STATUS_PERMITTED[status],
+                required_permissions=required_permissions,
+                missing_permissions=missing_permissions,
+                post_change_state=post_state,
+            )
+
+        # Everything past max_actions is skipped without looking at its score.
+        results[max_actions:] = [
+            make_result(
+                audit_id=f"{audit_prefix}-{index:08x}",
+                recommendation=recommendation,
+                score=score,
+                status=ExecutionActionStatus.SKIPPED,
+                message=max_actions_message,
+                permitted=True,
+                simulated=dry_run,
+                pre_change_state=capture_pre(recommendation),
+            )
+            for index, (recommendation, score) in enumerate(
+                zip(recommendations[max_actions:], scores_in_order[max_actions:]), start=max_actions
+            )
+        ]
+
+        if cache_key is not None:
+            # The cache keeps its own copies: the results returned here may be
+            # changed by the caller.
+            cached_results = tuple(_detached_copy(result) for result in results)
+            self._dry_run_cache.set(cache_key, (plan.eligible, cached_results))
+        return plan
+
+    def _align_scores(
+        self,
+        recommendations: list[Recommendation],
+        scores: list[RiskScore],
+    ) -> list[RiskScore | None]:
+        """Return each recommendation's score (or None), by position.
+
+        Scores straight from the scoring step are already in recommendation
+        order; that case is confirmed with one zip pass and used as-is.
+        """
+        if len(scores) == len(recommendations) and all(
+            score.recommendation_id == rec.id for score, rec in zip(scores, recommendations)
+        ):
+            return scores
+        score_by_id = {score.recommendation_id: score for score in scores}
+        return [score_by_id.get(rec.id) for rec in recommendations]
 
-        return ExecuteResponse(
-            execution_id=execution_id,
-            run_id=request.run_id,
+    def _run_plan(
+        self,
+        plan: _ExecutionPlan,
+        lanes: list[list[_PendingAction]] | None,
+        pool: ThreadPoolExecutor | None,
+    ) -> ExecuteResponse:
+        if lanes is None:
+            lanes = plan.lanes()
+        if pool is not None and len(lanes) > 1:
+            for _ in pool.map(functools.partial(self._run_lane, plan), lanes):
+                pass
+        else:
+            for lane in lanes:
+                self._run_lane(plan, lane)
+        return self._finalize(plan)
+
+    def _run_lane(self, plan: _ExecutionPlan, lane: list[_PendingAction]) -> None:
+        for action in lane:
+            plan.results[action.index] = self._run_action(action, plan)
+
+    def _run_action(self, action: _PendingAction, plan: _ExecutionPlan) -> ExecutionActionResult:
+        recommendation = action.recommendation
+        # Lifecycle actions are made idempotent by the prefetched rule cache and
+        # need their own pre-change snapshot, so only object actions are deduped.
+        dedupe = recommendation.recommendation_type != RecommendationType.ADD_LIFECYCLE_POLICY
+        key = action.idempotency_key
+        if dedupe and key in plan.applied:
+            # Nothing is changed by this action, so it must not be rolled back.
+            status, message, extra_state = (
+                ExecutionActionStatus.SKIPPED,
+                f"Already applied in this execution: {plan.applied[key]}",
+                {},
+            )
+        else:
+            status, message, extra_state = self._execute_action(recommendation, plan.lifecycle_rules)
+            if dedupe and status != ExecutionActionStatus.FAILED:
+                plan.applied[key] = message
+        if extra_state:
+            # pre_state is this action's own snapshot (already bound into emit).
+            action.pre_state.update(extra_state)
+        return action.emit(
+            status=status,
+            message=message,
+            permitted=True,
+            required_permissions=action.required_permissions,
+            post_change_state=(
+                self._capture_post_change_state(recommendation, simulated=False)
+                if status == ExecutionActionStatus.EXECUTED
+                else None
+            ),
+        )
+
+    def _finalize(self, plan: _ExecutionPlan) -> ExecuteResponse:
+        counts = Counter(result.status for result in plan.results)
+
+        return ExecuteResponse.model_construct(
+            execution_id=plan.execution_id,
+            run_id=plan.run_id,
             status=RunStatus.EXECUTED,
-            mode=effective_mode,
-            dry_run=dry_run,
-            eligible=eligible,
-            executed=executed,
-            skipped=skipped,
-            blocked=blocked,
-            failed=failed,
-            action_results=action_results,
+            mode=plan.mode,
+            dry_run=plan.dry_run,
+            eligible=plan.eligible,
+            executed=counts[ExecutionActionStatus.EXECUTED] + counts[ExecutionActionStatus.DRY_RUN],
+            skipped=counts[ExecutionActionStatus.SKIPPED],
+            blocked=counts[ExecutionActionStatus.BLOCKED],
+            failed=counts[ExecutionActionStatus.FAILED],
+            action_results=plan.results,
             executed_at=datetime.now(timezone.utc),
         )
 
@@ -254,106 +604,142 @@ class ExecutionService:
 
         return request.mode, request.mode == ExecutionMode.DRY_RUN
 
-    def _is_mode_eligible(self, mode: ExecutionMode, score: RiskScore) -> bool:
-        if mode == ExecutionMode.DRY_RUN:
-            return True
+    def _mode_predicate(self, mode: ExecutionMode) -> Callable[[RiskScore], bool]:
+        """Specialize _is_mode_eligible for a mode that is fixed for a whole run."""
         if mode == ExecutionMode.SAFE:
-            return score.safe_to_automate
+            return attrgetter("safe_to_automate")
         if mode == ExecutionMode.STANDARD:
-            return not score.requires_approval
-        return True
-
-    def _granted_permissions(self) -> set[str]:
-        raw = os.getenv(
-            "EXECUTOR_GRANTED_PERMISSIONS",
-            ",".join(
-                [
-                    "s3:GetObject",
-                    "s3:PutObject",
-                    "s3:GetLifecycleConfiguration",
-                    "s3:PutLifecycleConfiguration",
-                    "s3:ListBucketMultipartUploads",
-                    "s3:AbortMultipartUpload",
-                ]
-            ),
-        )
-        return {item.strip() for item in raw.split(",") if item.strip()}
+            return lambda score: not score.requires_approval
+        return lambda score: True
 
-    def _execute_action(self, recommendation: Recommendation) -> tuple[bool, str, dict]:
-        rec = recommendation
+    def _is_mode_eligible(self, mode: ExecutionMode, score: RiskScore) -> bool:
+        return self._mode_predicate(mode)(score)
+
+    def _granted_permissions(self) -> frozenset[str]:
+        return _parse_permissions(os.getenv("EXECUTOR_GRANTED_PERMISSIONS", _DEFAULT_GRANTED_PERMISSIONS))
+
+    def _get_lifecycle_rules(self, bucket: str) -> list[dict] | None:
         try:
-            if rec.recommendation_type == RecommendationType.CHANGE_STORAGE_CLASS:
-                if rec.target_storage_class is None:
-                    return False, "Cannot execute: target_storage_class is not set on recommendation.", {}
-                target = rec.target_storage_class.value
-                self.s3.copy_object(
-                    Bucket=rec.bucket,
-                    Key=rec.key,
-                    CopySource={"Bucket": rec.bucket, "Key": rec.key},
-                    StorageClass=target,
-                    MetadataDirective="COPY",
-                    TaggingDirective="COPY",
-                )
-                return True, f"Transitioned {rec.key} to {target}.", {}
-
-            if rec.recommendation_type == RecommendationType.ADD_LIFECYCLE_POLICY:
-                # Capture existing rules before mutating (needed for rollback)
+            return self.s3.get_bucket_lifecycle_configuration(Bucket=bucket)["Rules"]
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "NoSuchLifecycleConfiguration":
+                return None
+            raise
+
+    def _prefetch_lifecycle_rules(self, buckets: set[str]) -> dict[str, list[dict] | None]:
+        """Fetch existing lifecycle rules for several buckets concurrently.
+
+        Buckets whose GET fails are left out; the action for that bucket
+        retries the call itself and reports the error on its result.
+        """
+        if not buckets:
+            return {}
+
+        prefetched: dict[str, list[dict] | None] = {}
+        with ThreadPoolExecutor(max_workers=min(_LIFECYCLE_PREFETCH_WORKERS, len(buckets))) as pool:
+            futures = {bucket: pool.submit(self._get_lifecycle_rules, bucket) for bucket in buckets}
+            for bucket, future in futures.items():
                 try:
-                    existing_rules = self.s3.get_bucket_lifecycle_configuration(
-                        Bucket=rec.bucket
-                    )["Rules"]
-                except ClientError as e:
-                    if e.response["Error"]["Code"] == "NoSuchLifecycleConfiguration":
-                        existing_rules = None
-                    else:
-                        raise
-
-                extra = {"existing_lifecycle_rules": existing_rules}
-
-                new_rules = [
-                    {
-                        "ID": "aws-cost-optimizer-archive",
-                        "Status": "Enabled",
-                        "Filter": {"Prefix": ""},
-                        "Transitions": [{"Days": 90, "StorageClass": "GLACIER_IR"}],
-                    },
-                    {
-                        "ID": "aws-cost-optimizer-multipart-cleanup",
-                        "Status": "Enabled",
-                        "Filter": {"Prefix": ""},
-                        "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 7},
-                    },
-                ]
-                existing_ids = {r["ID"] for r in (existing_rules or [])}
-                merged = (existing_rules or []) + [
-                    r for r in new_rules if r["ID"] not in existing_ids
-                ]
-                self.s3.put_bucket_lifecycle_configuration(
-                    Bucket=rec.bucket,
-                    LifecycleConfiguration={"Rules": merged},
-                )
-                return True, f"Applied lifecycle policy to {rec.bucket}.", extra
-
-            if rec.recommendation_type == RecommendationType.DELETE_INCOMPLETE_UPLOAD:
-                if rec.upload_id is None:
-                    return False, "Cannot execute: upload_id is not set on recommendation.", {}
-                self.s3.abort_multipart_upload(
-                    Bucket=rec.bucket,
-                    Key=rec.key,
-                    UploadId=rec.upload_id,
-                )
-                return True, f"Aborted incomplete upload for {rec.key}.", {}
-
-            if rec.recommendation_type == RecommendationType.DELETE_STALE_OBJECT:
-                self.s3.delete_object(Bucket=rec.bucket, Key=rec.key)
-                return True, f"Deleted stale object {rec.key}.", {}
+                    prefetched[bucket] = future.result()
+                except ClientError:
+                    continue
+        return prefetched
 
+    def _execute_action(
+        self,
+        recommendation: Recommendation,
+        lifecycle_rules: dict[str, list[dict] | None] | None = None,
+    ) -> tuple[ExecutionActionStatus, str, dict]:
+        handler = self._ACTION_HANDLERS.get(recommendation.recommendation_type)
+        if handler is None:
+            return ExecutionActionStatus.FAILED, "Unsupported recommendation type.", {}
+        try:
+            return handler(self, recommendation, {} if lifecycle_rules is None else lifecycle_rules)
         except ClientError as e:
             code = e.response["Error"]["Code"]
             msg = e.response["Error"]["Message"]
-            return False, f"S3 error ({code}): {msg}", {}
-
-        return False, "Unsupported recommendation type.", {}
+            return ExecutionActionStatus.FAILED, f"S3 error ({code}): {msg}", {}
+
+    def _change_storage_class(
+        self, rec: Recommendation, lifecycle_rules: dict[str, list[dict] | None]
+    ) -> tuple[ExecutionActionStatus, str, dict]:
+        if rec.target_storage_class is None:
+            return (
+                ExecutionActionStatus.FAILED,
+                "Cannot execute: target_storage_class is not set on recommendation.",
+                {},
+            )
+        target = rec.target_storage_class.value
+        # S3 omits StorageClass for STANDARD objects. Copying an object
+        # onto itself without changing anything is rejected, so probe first.
+        current = self.s3.head_object(Bucket=rec.bucket, Key=rec.key).get("StorageClass", "STANDARD")
+        if current == target:
+            # A no-op: SKIPPED keeps it out of rollback, which would otherwise
+            # move the object back to its scan-time class.
+            return ExecutionActionStatus.SKIPPED, f"{rec.key} is already in {target}.", {}
+        self.s3.copy_object(
+            Bucket=rec.bucket,
+            Key=rec.key,
+            CopySource={"Bucket": rec.bucket, "Key": rec.key},
+            StorageClass=target,
+            MetadataDirective="COPY",
+            TaggingDirective="COPY",
+        )
+        return ExecutionActionStatus.EXECUTED, f"Transitioned {rec.key} to {target}.", {}
+
+    def _add_lifecycle_policy(
+        self, rec: Recommendation, lifecycle_rules: dict[str, list[dict] | None]
+    ) -> tuple[ExecutionActionStatus, str, dict]:
+        # Capture existing rules before mutating (needed for rollback)
+        if rec.bucket in lifecycle_rules:
+            existing_rules = lifecycle_rules[rec.bucket]
+        else:
+            existing_rules = self._get_lifecycle_rules(rec.bucket)
+
+        extra = {"existing_lifecycle_rules": existing_rules}
+
+        # Existing rules win on ID collisions; ours are only appended.
+        rules_by_id = {r["ID"]: r for r in existing_rules or []}
+        existing_count = len(rules_by_id)
+        for rule_id, rule in _LIFECYCLE_RULES_BY_ID.items():
+            rules_by_id.setdefault(rule_id, rule)
+        if len(rules_by_id) == existing_count:
+            # No PUT was made, so there is nothing of ours to roll back; the
+            # captured rules may already include an earlier action's merge.
+            return ExecutionActionStatus.SKIPPED, f"Lifecycle policy already present on {rec.bucket}.", extra
+
+        merged = list(rules_by_id.values())
+        self.s3.put_bucket_lifecycle_configuration(
+            Bucket=rec.bucket,
+            LifecycleConfiguration={"Rules": merged},
+        )
+        lifecycle_rules[rec.bucket] = merged
+        return ExecutionActionStatus.EXECUTED, f"Applied lifecycle policy to {rec.bucket}.", extra
+
+    def _abort_incomplete_upload(
+        self, rec: Recommendation, lifecycle_rules: dict[str, list[dict] | None]
+    ) -> tuple[ExecutionActionStatus, str, dict]:
+        if rec.upload_id is None:
+            return ExecutionActionStatus.FAILED, "Cannot execute: upload_id is not set on recommendation.", {}
+        self.s3.abort_multipart_upload(
+            Bucket=rec.bucket,
+            Key=rec.key,
+            UploadId=rec.upload_id,
+        )
+        return ExecutionActionStatus.EXECUTED, f"Aborted incomplete upload for {rec.key}.", {}
+
+    def _delete_stale_object(
+        self, rec: Recommendation, lifecycle_rules: dict[str, list[dict] | None]
+    ) -> tuple[ExecutionActionStatus, str, dict]:
+        self.s3.delete_object(Bucket=rec.bucket, Key=rec.key)
+        return ExecutionActionStatus.EXECUTED, f"Deleted stale object {rec.key}.", {}
+
+    _ACTION_HANDLERS = {
+        RecommendationType.CHANGE_STORAGE_CLASS: _change_storage_class,
+        RecommendationType.ADD_LIFECYCLE_POLICY: _add_lifecycle_policy,
+        RecommendationType.DELETE_INCOMPLETE_UPLOAD: _abort_incomplete_upload,
+        RecommendationType.DELETE_STALE_OBJECT: _delete_stale_object,
+    }
 
     def _result(
         self,
@@ -363,11 +749,11 @@ class ExecutionService:
         status: ExecutionActionStatus,
         message: str,
         permitted: bool,
-        required_permissions: list[str],
-        missing_permissions: list[str],
         simulated: bool,
         pre_change_state: dict,
-        post_change_state: dict | None,
+        required_permissions: tuple[str, ...] = (),
+        missing_permissions: list[str] | None = None,
+        post_change_state: dict | None = None,
     ) -> ExecutionActionResult:
         requires_approval = score.requires_approval if score else True
         risk_level = score.risk_level if score else recommendation.risk_level
@@ -378,7 +764,9 @@ class ExecutionService:
         )
         rollback_status = RollbackStatus.PENDING if rollback_available else RollbackStatus.NOT_APPLICABLE
 
-        return ExecutionActionResult(
+        # Every field comes from already-validated models or values built here,
+        # so skip re-validation. Validation still applies to API inputs.
+        return ExecutionActionResult.model_construct(
             audit_id=audit_id,
             recommendation_id=recommendation.id,
             recommendation_type=recommendation.recommendation_type,
@@ -389,8 +777,8 @@ class ExecutionService:
             status=status,
             message=message,
             permitted=permitted,
-            required_permissions=required_permissions,
-            missing_permissions=missing_permissions,
+            required_permissions=list(required_permissions),
+            missing_permissions=missing_permissions or [],
             simulated=simulated,
             pre_change_state=pre_change_state,
             post_change_state=post_change_state,
@@ -410,28 +798,8 @@ class ExecutionService:
         }
 
     def _capture_post_change_state(self, recommendation: Recommendation, simulated: bool) -> dict:
-        if recommendation.recommendation_type == RecommendationType.CHANGE_STORAGE_CLASS:
-            return {
-                "action": "change_storage_class",
-                "target": recommendation.recommended_action,
-                "simulated": simulated,
-            }
-        if recommendation.recommendation_type == RecommendationType.ADD_LIFECYCLE_POLICY:
-            return {
-                "action": "add_lifecycle_policy",
-                "target": recommendation.recommended_action,
-                "simulated": simulated,
-            }
-        if recommendation.recommendation_type == RecommendationType.DELETE_INCOMPLETE_UPLOAD:
-            return {
-                "action": "delete_incomplete_upload",
-                "target": recommendation.key,
-                "simulated": simulated,
-            }
-        if recommendation.recommendation_type == RecommendationType.DELETE_STALE_OBJECT:
-            return {
-                "action": "delete_stale_object",
-                "target": recommendation.key,
-                "simulated": simulated,
-            }
-        return {"action": "unknown", "simulated": simulated}
+        spec = _POST_STATE_SPECS.get(recommendation.recommendation_type)
+        if spec is None:
+            return {"action": "unknown", "simulated": simulated}
+        prototype, target = spec
+        return {**prototype, "target": target(recommendation), "simulated": simulated}
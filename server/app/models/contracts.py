@@ -1,27 +1,27 @@
 from datetime import datetime
-from enum import Enum
+from enum import StrEnum
 import logging
 from typing import Any, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 _log = logging.getLogger(__name__)
 
 
-class RiskLevel(str, Enum):
+class RiskLevel(StrEnum):
     LOW = "low"
     MEDIUM = "medium"
     HIGH = "high"
 
 
-class RecommendationType(str, Enum):
+class RecommendationType(StrEnum):
     CHANGE_STORAGE_CLASS = "change_storage_class"
     ADD_LIFECYCLE_POLICY = "add_lifecycle_policy"
     DELETE_INCOMPLETE_UPLOAD = "delete_incomplete_upload"
     DELETE_STALE_OBJECT = "delete_stale_object"
 
 
-class StorageClass(str, Enum):
+class StorageClass(StrEnum):
     STANDARD = "STANDARD"
     REDUCED_REDUNDANCY = "REDUCED_REDUNDANCY"
     GLACIER = "GLACIER"
@@ -33,20 +33,23 @@ class StorageClass(str, Enum):
     EXPRESS_ONEZONE = "EXPRESS_ONEZONE"
 
 
-class ExecutionMode(str, Enum):
+class ExecutionMode(StrEnum):
     DRY_RUN = "dry_run"
     SAFE = "safe"
     STANDARD = "standard"
     FULL = "full"
 
 
-class RunStatus(str, Enum):
+class RunStatus(StrEnum):
     SCANNED = "scanned"
     SCORED = "scored"
     EXECUTED = "executed"
 
 
 class Recommendation(BaseModel):
+    # Produced once by the scanner; every later step only reads it.
+    model_config = ConfigDict(frozen=True)
+
     id: str
     bucket: str
     key: Optional[str] = None
@@ -81,6 +84,8 @@ class Recommendation(BaseModel):
 
 
 class RiskFactorScores(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     reversibility: int = Field(ge=0, le=100)
     data_loss_risk: int = Field(ge=0, le=100)
     age_confidence: int = Field(ge=0, le=100)
@@ -89,6 +94,9 @@ class RiskFactorScores(BaseModel):
 
 
 class RiskScore(BaseModel):
+    # Scores and estimates are recomputed, never edited in place.
+    model_config = ConfigDict(frozen=True)
+
     recommendation_id: str
     risk_score: int = Field(ge=0, le=100)
     confidence_score: int = Field(ge=0, le=100)
@@ -102,6 +110,8 @@ class RiskScore(BaseModel):
 
 
 class SavingsEstimate(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     recommendation_id: str
     current_monthly_cost: float = Field(ge=0)
     projected_monthly_cost: float = Field(ge=0)
@@ -161,7 +171,7 @@ class ExecuteRequest(BaseModel):
     max_actions: int = Field(default=100, ge=1, le=10000)
 
 
-class ExecutionActionStatus(str, Enum):
+class ExecutionActionStatus(StrEnum):
     DRY_RUN = "dry_run"
     EXECUTED = "executed"
     SKIPPED = "skipped"
@@ -169,7 +179,7 @@ class ExecutionActionStatus(str, Enum):
     FAILED = "failed"
 
 
-class RollbackStatus(str, Enum):
+class RollbackStatus(StrEnum):
     PENDING = "pending"
     NOT_APPLICABLE = "not_applicable"
     ROLLED_BACK = "rolled_back"
@@ -177,6 +187,10 @@ class RollbackStatus(str, Enum):
 
 
 class ExecutionActionResult(BaseModel):
+    # Results are never mutated after the executor builds them; the audit
+    # trail is the source of truth for later changes (see update_rollback_status).
+    model_config = ConfigDict(frozen=True)
+
     audit_id: str
     recommendation_id: str
     recommendation_type: RecommendationType
@@ -242,7 +256,7 @@ class RollbackRequest(BaseModel):
     dry_run: bool = True
 
 
-class RollbackActionStatus(str, Enum):
+class RollbackActionStatus(StrEnum):
     DRY_RUN = "dry_run"
     ROLLED_BACK = "rolled_back"
     SKIPPED = "skipped"
@@ -1,11 +1,17 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import functools
+import itertools
 import logging
-from typing import Any
+import os
+from typing import Any, Callable, Iterator
 import uuid
 
-import boto3
 from botocore.exceptions import ClientError
 
+from app.core.aws import get_s3_client
+from app.core.cache import TTLCache
 from app.models import Recommendation, RecommendationType, RiskLevel, ScanRequest, StorageClass
 
 _log = logging.getLogger(__name__)
@@ -14,8 +20,76 @@ _COLD_DAYS = 90        # STANDARD object older than this → CHANGE_STORAGE_CLAS
 _STALE_DAYS = 365      # Any object older than this → DELETE_STALE_OBJECT
 _MULTIPART_DAYS = 7    # Incomplete upload older than this → DELETE_INCOMPLETE_UPLOAD
 _TARGET_CLASS = StorageClass.GLACIER_IR
+_TRANSITION_ACTION = f"Transition to {_TARGET_CLASS.value}"
 _STANDARD_PRICE = 0.023   # $/GB/month
 _GLACIER_IR_PRICE = 0.004
+_ARCHIVE_SAVINGS_PER_GB = _STANDARD_PRICE - _GLACIER_IR_PRICE
+_SECONDS_PER_DAY = 86400
+# Bucket lists and lifecycle configurations rarely change between back-to-back
+# scans. Live executes and rollbacks call invalidate_cache().
+_BUCKET_CACHE_SIZE = 1024
+_BUCKET_CACHE_TTL_SECONDS = 60
+_BUCKET_LIST_KEY = ("list_buckets",)
+
+# Recommendation IDs are a per-process random prefix plus a counter: unique
+# across processes like uuid4, without drawing entropy per recommendation.
+# next() on itertools.count is atomic, so scan worker threads can share it.
+_ID_PREFIX = uuid.uuid4().hex[:16]
+_id_counter = itertools.count()
+
+
+def _reset_recommendation_ids() -> None:
+    # A forked worker must not replay its parent's prefix and counter.
+    global _ID_PREFIX, _id_counter
+    _ID_PREFIX = uuid.uuid4().hex[:16]
+    _id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only; Windows never forks
+    os.register_at_fork(after_in_child=_reset_recommendation_ids)
+
+
+def _next_recommendation_id() -> str:
+    return f"{_ID_PREFIX}-{next(_id_counter):08x}"
+
+
+def _aborts_stale_uploads(rule: dict[str, Any]) -> bool:
+    # Only an enabled, bucket-wide rule guarantees S3 cleans up every upload
+    # that _check_multipart_uploads would otherwise report.
+    if rule.get("Status") != "Enabled":
+        return False
+    days = rule.get("AbortIncompleteMultipartUpload", {}).get("DaysAfterInitiation")
+    if days is None or days > _MULTIPART_DAYS:
+        return False
+    rule_filter = rule.get("Filter", {})
+    return not rule.get("Prefix") and set(rule_filter) <= {"Prefix"} and not rule_filter.get("Prefix")
+
+
+def _age_days(now_ts: float, moment: datetime) -> int:
+    # Same result as (now - moment).days, without building a timedelta.
+    return int((now_ts - moment.timestamp()) // _SECONDS_PER_DAY)
+
+
+# Reasons depend only on the age in days, which objects in a bucket share
+# heavily, so each distinct text is formatted once and the string reused.
+@functools.lru_cache(maxsize=4096)
+def _stale_reason(age_days: int) -> str:
+    return f"Object has not been modified in {age_days} days ({age_days // 365} year(s))."
+
+
+@functools.lru_cache(maxsize=4096)
+def _cold_reason(age_days: int) -> str:
+    return f"Object has been in STANDARD storage for {age_days} days without modification."
+
+
+@functools.lru_cache(maxsize=1024)
+def _multipart_reason(age_days: int) -> str:
+    return f"Multipart upload has been incomplete for {age_days} days."
+
+
+# Recommendations are built with model_construct throughout: every field is
+# computed here from S3 metadata (storage classes are already coerced to
+# StorageClass or None), so re-validating each one is pure overhead.
 
 
 class ScannerService:
@@ -30,61 +104,154 @@ class ScannerService:
 
     def __init__(self, s3_client: Any = None) -> None:
         self._s3 = s3_client
+        self._bucket_cache = TTLCache(maxsize=_BUCKET_CACHE_SIZE, ttl=_BUCKET_CACHE_TTL_SECONDS)
 
     @property
     def s3(self) -> Any:
         if self._s3 is None:
-            self._s3 = boto3.client("s3")
+            self._s3 = get_s3_client()
         return self._s3
 
     def scan(self, request: ScanRequest) -> list[Recommendation]:
+        return list(self.iter_scan(request))
+
+    def iter_scan(self, request: ScanRequest) -> Iterator[Recommendation]:
+        """Yield recommendations bucket by bucket, in bucket order.
+
+        Each bucket's recommendations are yielded as soon as that bucket (and
+        every bucket before it) is done, so callers can stream them.
+        """
+        buckets = self._resolve_buckets(request)
+        max_objects = request.max_objects_per_bucket
+        # _bucket_checks submits two tasks per bucket.
+        workers = min(int(os.getenv("SCANNER_WORKERS", "16")), len(buckets) * 2)
+        if workers <= 1:
+            for bucket in buckets:
+                yield from self._scan_bucket(bucket, max_objects)
+            return
+
+        # Scans are bound by S3 round trips, so every bucket's independent
+        # checks go on one flat pool, which also caps the S3 calls in flight.
+        # Resolve the shared client first so every worker uses it.
+        _ = self.s3
+        pool = ThreadPoolExecutor(max_workers=workers)
+        try:
+            submitted = [
+                (bucket, [pool.submit(check) for check in self._bucket_checks(bucket, max_objects)])
+                for bucket in buckets
+            ]
+            for bucket, futures in submitted:
+                yield from self._assemble_bucket(bucket, *(future.result() for future in futures))
+        finally:
+            # A caller that stops early shouldn't wait on buckets it won't read.
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    async def scan_async(self, request: ScanRequest, concurrency: int = 20) -> list[Recommendation]:
+        """Same as scan(), for callers already on an event loop.
+
+        Each bucket is scanned on a worker thread with the shared client; at
+        most ``concurrency`` buckets are in flight at once. Results keep
+        bucket order.
+        """
+        _ = self.s3  # create the shared client before worker threads need it
+        buckets = await asyncio.to_thread(self._resolve_buckets, request)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def scan_one(bucket: str) -> list[Recommendation]:
+            async with semaphore:
+                return await asyncio.to_thread(self._scan_bucket, bucket, request.max_objects_per_bucket)
+
+        per_bucket = await asyncio.gather(*(scan_one(bucket) for bucket in buckets))
+        return list(itertools.chain.from_iterable(per_bucket))
+
+    def invalidate_cache(self) -> None:
+        """Forget cached bucket lists and lifecycle probes, e.g. after a live execute."""
+        self._bucket_cache.clear()
+
+    def _resolve_buckets(self, request: ScanRequest) -> list[str]:
         excluded = set(request.exclude_buckets)
 
         if request.include_buckets:
-            buckets = [b for b in request.include_buckets if b not in excluded]
-        else:
+            return [b for b in request.include_buckets if b not in excluded]
+        names = self._bucket_cache.get(_BUCKET_LIST_KEY)
+        if names is None:
             try:
                 resp = self.s3.list_buckets()
-                buckets = [
-                    b["Name"] for b in resp.get("Buckets", []) if b["Name"] not in excluded
-                ]
             except ClientError:
-                buckets = []
-
-        recommendations: list[Recommendation] = []
-        for bucket in buckets:
-            recommendations.extend(
-                self._scan_bucket(bucket, request.max_objects_per_bucket)
-            )
-        return recommendations
+                return []
+            names = tuple(b["Name"] for b in resp.get("Buckets", []))
+            self._bucket_cache.set(_BUCKET_LIST_KEY, names)
+        return [name for name in names if name not in excluded]
 
     def _scan_bucket(self, bucket: str, max_objects: int) -> list[Recommendation]:
-        recommendations: list[Recommendation] = []
+        return self._assemble_bucket(bucket, *(check() for check in self._bucket_checks(bucket, max_objects)))
 
-        object_recs, _total_size_bytes, standard_size_bytes = self._scan_objects(bucket, max_objects)
-        recommendations.extend(object_recs)
-        lifecycle_rec = self._check_lifecycle(bucket, total_size_bytes=standard_size_bytes)
-        if lifecycle_rec:
-            recommendations.append(lifecycle_rec)
-        recommendations.extend(self._check_multipart_uploads(bucket))
+    def _bucket_checks(self, bucket: str, max_objects: int) -> tuple[Callable[[], Any], ...]:
+        """The bucket's independent S3 reads: object listing, then lifecycle and uploads.
 
+        The lifecycle probe and multipart listing share a task because the
+        listing is skipped when a lifecycle rule already aborts stale uploads.
+        The lifecycle recommendation is built afterwards, in _assemble_bucket,
+        because its savings estimate needs the listing's STANDARD bytes.
+        """
+        return (
+            functools.partial(self._scan_objects, bucket, max_objects),
+            functools.partial(self._check_lifecycle_and_uploads, bucket),
+        )
+
+    def _check_lifecycle_and_uploads(self, bucket: str) -> tuple[bool, list[Recommendation]]:
+        missing, aborts_multipart = self._lifecycle_status(bucket)
+        if aborts_multipart:
+            return missing, []
+        return missing, self._check_multipart_uploads(bucket)
+
+    def _assemble_bucket(
+        self,
+        bucket: str,
+        objects: tuple[list[Recommendation], int, int],
+        lifecycle: tuple[bool, list[Recommendation]],
+    ) -> list[Recommendation]:
+        object_recs, _total_size_bytes, standard_size_bytes = objects
+        lifecycle_missing, multipart_recs = lifecycle
+        # _scan_objects hands back a fresh list, so grow it in place rather than copy.
+        recommendations = object_recs
+        if lifecycle_missing:
+            recommendations.append(self._lifecycle_recommendation(bucket, standard_size_bytes))
+        recommendations.extend(multipart_recs)
         return recommendations
 
     def _scan_objects(self, bucket: str, max_objects: int) -> tuple[list[Recommendation], int, int]:
         recs: list[Recommendation] = []
         now = datetime.now(timezone.utc)
-        count = 0
+        # Comparing against cutoffs is equivalent to checking (now - t).days
+        # against the thresholds; ages are only computed for matches.
+        stale_cutoff = now - timedelta(days=_STALE_DAYS)
+        cold_cutoff = now - timedelta(days=_COLD_DAYS)
+        candidate_cutoff = max(stale_cutoff, cold_cutoff)
+        now_ts = now.timestamp()
         total_size_bytes = 0
         standard_size_bytes = 0
 
         try:
             paginator = self.s3.get_paginator("list_objects_v2")
-            for page in paginator.paginate(Bucket=bucket):
-                for obj in page.get("Contents", []):
-                    if count >= max_objects:
-                        break
-                    count += 1
+            # MaxItems stops the listing at max_objects; PageSize keeps small
+            # caps from fetching a full 1000-key page.
+            pages = paginator.paginate(
+                Bucket=bucket,
+                PaginationConfig={"PageSize": min(1000, max_objects), "MaxItems": max_objects},
+            )
+            for page in pages:
+                contents = page.get("Contents", [])
+                # Totals cover every listed object. Most objects are too young
+                # for either recommendation, so only older ones reach the
+                # per-object branches below.
+                total_size_bytes += sum(obj.get("Size", 0) for obj in contents)
+                standard_size_bytes += sum(
+                    obj.get("Size", 0) for obj in contents if obj.get("StorageClass", "STANDARD") == "STANDARD"
+                )
+                candidates = [obj for obj in contents if obj["LastModified"] <= candidate_cutoff]
 
+                for obj in candidates:
                     key: str = obj["Key"]
                     size_bytes: int = obj.get("Size", 0)
                     storage_class_raw: str = obj.get("StorageClass", "STANDARD")
@@ -97,42 +264,35 @@ class ScannerService:
                         )
                         storage_class = None
                     last_modified: datetime = obj["LastModified"]
-                    age_days = (now - last_modified).days
-                    size_gb = size_bytes / (1024 ** 3)
-                    total_size_bytes += size_bytes
-                    if storage_class_raw == "STANDARD":
-                        standard_size_bytes += size_bytes
-
-                    if age_days >= _STALE_DAYS:
-                        recs.append(Recommendation(
-                            id=str(uuid.uuid4()),
+
+                    if last_modified <= stale_cutoff:
+                        age_days = _age_days(now_ts, last_modified)
+                        size_gb = size_bytes / (1024 ** 3)
+                        recs.append(Recommendation.model_construct(
+                            id=_next_recommendation_id(),
                             bucket=bucket,
                             key=key,
                             recommendation_type=RecommendationType.DELETE_STALE_OBJECT,
                             risk_level=RiskLevel.HIGH,
-                            reason=(
-                                f"Object has not been modified in {age_days} days "
-                                f"({age_days // 365} year(s))."
-                            ),
+                            reason=_stale_reason(age_days),
                             recommended_action="Delete stale object",
                             estimated_monthly_savings=round(_STANDARD_PRICE * size_gb, 4),
                             size_bytes=size_bytes,
                             storage_class=storage_class,
                             last_modified=last_modified,
                         ))
-                    elif age_days >= _COLD_DAYS and storage_class_raw == "STANDARD":
-                        savings = round((_STANDARD_PRICE - _GLACIER_IR_PRICE) * size_gb, 4)
-                        recs.append(Recommendation(
-                            id=str(uuid.uuid4()),
+                    elif last_modified <= cold_cutoff and storage_class_raw == "STANDARD":
+                        age_days = _age_days(now_ts, last_modified)
+                        size_gb = size_bytes / (1024 ** 3)
+                        savings = round(_ARCHIVE_SAVINGS_PER_GB * size_gb, 4)
+                        recs.append(Recommendation.model_construct(
+                            id=_next_recommendation_id(),
                             bucket=bucket,
                             key=key,
                             recommendation_type=RecommendationType.CHANGE_STORAGE_CLASS,
                             risk_level=RiskLevel.MEDIUM,
-                            reason=(
-                                f"Object has been in STANDARD storage for {age_days} days "
-                                f"without modification."
-                            ),
-                            recommended_action=f"Transition to {_TARGET_CLASS.value}",
+                            reason=_cold_reason(age_days),
+                            recommended_action=_TRANSITION_ACTION,
                             estimated_monthly_savings=savings,
                             size_bytes=size_bytes,
                             storage_class=storage_class,
@@ -140,9 +300,6 @@ class ScannerService:
                             target_storage_class=_TARGET_CLASS,
                         ))
 
-                if count >= max_objects:
-                    break
-
         except ClientError as e:
             code = e.response["Error"]["Code"]
             if code not in ("AccessDenied", "NoSuchBucket", "AllAccessDisabled"):
@@ -150,38 +307,52 @@ class ScannerService:
 
         return recs, total_size_bytes, standard_size_bytes
 
-    def _check_lifecycle(self, bucket: str, *, total_size_bytes: int = 0) -> Recommendation | None:
+    def _lifecycle_status(self, bucket: str) -> tuple[bool, bool]:
+        """(no lifecycle configuration, a rule aborts every stale multipart upload)."""
+        cache_key = ("lifecycle", bucket)
+        status = self._bucket_cache.get(cache_key)
+        if status is None:
+            status = self._probe_lifecycle(bucket)
+            self._bucket_cache.set(cache_key, status)
+        return status
+
+    def _probe_lifecycle(self, bucket: str) -> tuple[bool, bool]:
         try:
-            self.s3.get_bucket_lifecycle_configuration(Bucket=bucket)
-            return None  # lifecycle policy already exists
+            resp = self.s3.get_bucket_lifecycle_configuration(Bucket=bucket)
         except ClientError as e:
             code = e.response["Error"]["Code"]
             if code == "NoSuchLifecycleConfiguration":
-                size_gb = total_size_bytes / (1024 ** 3)
-                estimated_savings = round((_STANDARD_PRICE - _GLACIER_IR_PRICE) * size_gb, 4)
-                return Recommendation(
-                    id=str(uuid.uuid4()),
-                    bucket=bucket,
-                    key=None,
-                    recommendation_type=RecommendationType.ADD_LIFECYCLE_POLICY,
-                    risk_level=RiskLevel.LOW,
-                    reason="Bucket has no lifecycle policy for archival or multipart cleanup.",
-                    recommended_action=(
-                        "Add lifecycle rules for 90-day archive and 7-day multipart abort."
-                    ),
-                    estimated_monthly_savings=estimated_savings,
-                    size_bytes=0,
-                    storage_class=None,
-                    last_modified=None,
-                )
+                return True, False
             if code not in ("AccessDenied", "NoSuchBucket"):
                 raise
-            return None
+            return False, False
+        # A lifecycle policy already exists.
+        return False, any(_aborts_stale_uploads(rule) for rule in resp.get("Rules", []))
+
+    def _lifecycle_recommendation(self, bucket: str, total_size_bytes: int) -> Recommendation:
+        size_gb = total_size_bytes / (1024 ** 3)
+        estimated_savings = round(_ARCHIVE_SAVINGS_PER_GB * size_gb, 4)
+        return Recommendation.model_construct(
+            id=_next_recommendation_id(),
+            bucket=bucket,
+            key=None,
+            recommendation_type=RecommendationType.ADD_LIFECYCLE_POLICY,
+            risk_level=RiskLevel.LOW,
+            reason="Bucket has no lifecycle policy for archival or multipart cleanup.",
+            recommended_action=(
+                "Add lifecycle rules for 90-day archive and 7-day multipart abort."
+            ),
+            estimated_monthly_savings=estimated_savings,
+            size_bytes=0,
+            storage_class=None,
+            last_modified=None,
+        )
 
     def _check_multipart_uploads(self, bucket: str) -> list[Recommendation]:
         recs: list[Recommendation] = []
         now = datetime.now(timezone.utc)
         cutoff = now - timedelta(days=_MULTIPART_DAYS)
+        now_ts = now.timestamp()
 
         try:
             paginator = self.s3.get_paginator("list_multipart_uploads")
@@ -189,16 +360,13 @@ class ScannerService:
                 for upload in page.get("Uploads", []):
                     initiated: datetime = upload["Initiated"]
                     if initiated < cutoff:
-                        recs.append(Recommendation(
-                            id=str(uuid.uuid4()),
+                        recs.append(Recommendation.model_construct(
+                            id=_next_recommendation_id(),
                             bucket=bucket,
                             key=upload["Key"],
                             recommendation_type=RecommendationType.DELETE_INCOMPLETE_UPLOAD,
                             risk_level=RiskLevel.LOW,
-                            reason=(
-                                f"Multipart upload has been incomplete for "
-                                f"{(now - initiated).days} days."
-                            ),
+                            reason=_multipart_reason(_age_days(now_ts, initiated)),
                             recommended_action="Abort incomplete multipart upload",
                             estimated_monthly_savings=0.0,
                             size_bytes=0,
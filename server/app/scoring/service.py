@@ -1,5 +1,9 @@
+from bisect import bisect_right
 from dataclasses import dataclass
 from datetime import datetime, timezone
+import functools
+import re
+from typing import Iterable, Iterator
 
 from app.models import (
     Recommendation,
@@ -9,10 +13,87 @@ from app.models import (
     RiskScore,
     SavingsEstimate,
     SavingsSummary,
+    StorageClass,
 )
 
+_GB = 1024 ** 3
+_SECONDS_PER_DAY = 86400
+_APPROVAL_SIZE_BYTES = 10 * _GB  # objects this large always need explicit approval
+
+# Threshold ladders: a value scores the entry after the last threshold it
+# meets, e.g. 15 GB meets 0.1 GB, 1 GB and 10 GB and scores _SIZE_SCORES[3].
+_AGE_THRESHOLDS_DAYS = (30, 90, 180, 365)
+_AGE_SCORES = (25, 45, 65, 80, 95)
+_SIZE_THRESHOLDS_BYTES = (0.1 * _GB, 1 * _GB, 10 * _GB, 100 * _GB)
+_SIZE_SCORES = (15, 35, 60, 80, 100)
+_IMPACT_THRESHOLDS = (1, 10, 50, 100)  # monthly savings, $
+_IMPACT_SCORES = (20, 40, 60, 80, 100)
+
+# Reason wording that signals an infrequently accessed object.
+_COLD_HINT_RE = re.compile(r"infrequent|cold|stale", re.IGNORECASE)
+
+_REVERSIBILITY_MESSAGES = (
+    "Action is irreversible.",
+    "Action is partially reversible.",
+    "Action is reversible.",
+)
+_DATA_LOSS_MESSAGES = (
+    "Low data loss risk.",
+    "Moderate data loss risk.",
+    "High data loss risk.",
+)
+_AGE_MESSAGES = (
+    "Object age data is weak.",
+    "Object age provides moderate confidence.",
+    "Object age supports high confidence.",
+)
+_SIZE_MESSAGES = (
+    "Small data size impact.",
+    "Medium data size impact.",
+    "Large data size increases blast radius.",
+)
+_ACCESS_MESSAGES = (
+    "Access pattern signal is limited.",
+    "Access pattern signal is strong.",
+)
 
-@dataclass
+# Storage classes a free-text action can name. One regex pass finds every
+# candidate; when an action names several, the earliest in
+# _TARGET_CLASS_PRECEDENCE wins (so "glacier_ir" beats "glacier").
+_TARGET_CLASS_RE = re.compile(
+    r"deep[_-]archive|glacier[_-]ir|glacier|intelligent|onezone|standard[_-]ia",
+    re.IGNORECASE,
+)
+_TARGET_CLASS_BY_NAME = {
+    "deep_archive": "DEEP_ARCHIVE",
+    "glacier_ir": "GLACIER_IR",
+    "glacier": "GLACIER",
+    "intelligent": "INTELLIGENT_TIERING",
+    "onezone": "ONEZONE_IA",
+    "standard_ia": "STANDARD_IA",
+}
+_TARGET_CLASS_PRECEDENCE = tuple(_TARGET_CLASS_BY_NAME.values())
+
+
+# Actions come from a handful of templates, so parses and normalisations are
+# memoised on the raw string.
+@functools.lru_cache(maxsize=64)
+def _parse_target_class(action: str) -> str:
+    matches = _TARGET_CLASS_RE.findall(action)
+    if not matches:
+        return "GLACIER_IR"
+    return min(
+        (_TARGET_CLASS_BY_NAME[match.lower().replace("-", "_")] for match in matches),
+        key=_TARGET_CLASS_PRECEDENCE.index,
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _normalize_storage_class(storage_class: str | None) -> str:
+    return (storage_class or "STANDARD").upper()
+
+
+@dataclass(slots=True)
 class ScoringResult:
     scores: list[RiskScore]
     savings_details: list[SavingsEstimate]
@@ -35,6 +116,13 @@ class ScoringService:
         RecommendationType.DELETE_STALE_OBJECT: 0,
     }
 
+    DATA_LOSS_RISK = {
+        RecommendationType.CHANGE_STORAGE_CLASS: 5,
+        RecommendationType.ADD_LIFECYCLE_POLICY: 0,
+        RecommendationType.DELETE_INCOMPLETE_UPLOAD: 10,
+        RecommendationType.DELETE_STALE_OBJECT: 100,
+    }
+
     STORAGE_PRICING = {
         "STANDARD": 0.023,
         "INTELLIGENT_TIERING": 0.023,
@@ -65,93 +153,109 @@ class ScoringService:
     def score(self, recommendations: list[Recommendation]) -> ScoringResult:
         scores: list[RiskScore] = []
         savings_details: list[SavingsEstimate] = []
+        for score, savings in self.score_iter(recommendations):
+            scores.append(score)
+            savings_details.append(savings)
+
+        summary = self._aggregate_savings(savings_details)
+        return ScoringResult(scores=scores, savings_details=savings_details, savings_summary=summary)
+
+    def score_iter(self, recommendations: Iterable[Recommendation]) -> Iterator[tuple[RiskScore, SavingsEstimate]]:
+        """Yield each recommendation's (score, savings estimate) as soon as it is computed.
+
+        Callers that stream results never hold the whole batch; score() is the
+        collecting wrapper that also builds the savings summary.
+        """
+        # The five factor scores only take a few hundred combinations, so the
+        # work derived from them is done once per combination in a batch.
+        derived: dict[tuple[int, ...], tuple[RiskFactorScores, list[str], int, int, RiskLevel]] = {}
+        # One clock read per batch, so every recommendation is aged against the same instant.
+        now_ts = datetime.now(timezone.utc).timestamp()
+        # Estimators are plain functions in the table, called with self.
+        savings_for = self.SAVINGS_CALCULATORS
+        fallback_savings = ScoringService._fallback_savings
+        raw_factor_scores = self._raw_factor_scores
+        impact_score_for = self._calculate_impact_score
+        execution_recommendation_for = self._execution_recommendation
 
         for recommendation in recommendations:
-            savings = self._calculate_savings(recommendation)
-            factor_scores, factor_messages = self._calculate_factor_scores(recommendation)
-            risk_score = self._calculate_weighted_risk(factor_scores)
-            confidence_score = self._calculate_confidence(factor_scores)
-            impact_score = self._calculate_impact_score(savings.monthly_savings)
+            # Read each field once; the helpers below take the model itself.
+            rec_type = recommendation.recommendation_type
+            is_stale_delete = rec_type == RecommendationType.DELETE_STALE_OBJECT
+
+            savings = savings_for.get(rec_type, fallback_savings)(self, recommendation)
+            raw_factors = raw_factor_scores(recommendation, now_ts)
+            entry = derived.get(raw_factors)
+            if entry is None:
+                factor_scores, factor_messages = self._build_factor_scores(*raw_factors)
+                weighted_risk = self._calculate_weighted_risk(factor_scores)
+                entry = derived[raw_factors] = (
+                    factor_scores,
+                    factor_messages,
+                    weighted_risk,
+                    self._calculate_confidence(factor_scores),
+                    self._risk_level_from_score(weighted_risk),
+                )
+            factor_scores, factor_messages, risk_score, confidence_score, risk_level = entry
 
-            risk_level = self._risk_level_from_score(risk_score)
             requires_approval = (
                 risk_score >= 55
-                or recommendation.recommendation_type == RecommendationType.DELETE_STALE_OBJECT
-                or recommendation.size_bytes >= 10 * 1024 * 1024 * 1024
-            )
-            safe_to_automate = (
-                risk_score < 30
-                and confidence_score >= 70
-                and recommendation.recommendation_type != RecommendationType.DELETE_STALE_OBJECT
+                or is_stale_delete
+                or recommendation.size_bytes >= _APPROVAL_SIZE_BYTES
             )
+            safe_to_automate = risk_score < 30 and confidence_score >= 70 and not is_stale_delete
 
-            score = RiskScore(
+            # Every value below is computed and clamped by this service, so
+            # the per-recommendation models skip re-validation.
+            score = RiskScore.model_construct(
                 recommendation_id=recommendation.id,
                 risk_score=risk_score,
                 confidence_score=confidence_score,
-                impact_score=impact_score,
+                impact_score=impact_score_for(savings.monthly_savings),
                 risk_level=risk_level,
                 requires_approval=requires_approval,
                 safe_to_automate=safe_to_automate,
-                execution_recommendation=self._execution_recommendation(
+                execution_recommendation=execution_recommendation_for(
                     risk_score=risk_score,
                     confidence_score=confidence_score,
                     requires_approval=requires_approval,
                     safe_to_automate=safe_to_automate,
                 ),
-                factors=factor_messages,
+                factors=list(factor_messages),
                 factor_scores=factor_scores,
             )
+            yield score, savings
 
-            scores.append(score)
-            savings_details.append(savings)
-
-        summary = self._aggregate_savings(savings_details)
-        return ScoringResult(scores=scores, savings_details=savings_details, savings_summary=summary)
-
-    def _calculate_factor_scores(self, recommendation: Recommendation) -> tuple[RiskFactorScores, list[str]]:
-        reversibility = self.REVERSIBILITY_SCORES.get(recommendation.recommendation_type, 50)
-        data_loss_risk = self._data_loss_risk(recommendation)
-        age_confidence = self._age_confidence(recommendation)
-        size_impact = self._size_impact(recommendation)
-        access_confidence = self._access_confidence(recommendation)
-
-        factors: list[str] = []
-        if reversibility >= 80:
-            factors.append("Action is reversible.")
-        elif reversibility >= 50:
-            factors.append("Action is partially reversible.")
-        else:
-            factors.append("Action is irreversible.")
-
-        if data_loss_risk >= 70:
-            factors.append("High data loss risk.")
-        elif data_loss_risk >= 35:
-            factors.append("Moderate data loss risk.")
-        else:
-            factors.append("Low data loss risk.")
-
-        if age_confidence >= 80:
-            factors.append("Object age supports high confidence.")
-        elif age_confidence >= 50:
-            factors.append("Object age provides moderate confidence.")
-        else:
-            factors.append("Object age data is weak.")
-
-        if size_impact >= 70:
-            factors.append("Large data size increases blast radius.")
-        elif size_impact >= 40:
-            factors.append("Medium data size impact.")
-        else:
-            factors.append("Small data size impact.")
+    def _raw_factor_scores(
+        self, recommendation: Recommendation, now_ts: float | None = None
+    ) -> tuple[int, int, int, int, int]:
+        return (
+            self.REVERSIBILITY_SCORES.get(recommendation.recommendation_type, 50),
+            self._data_loss_risk(recommendation),
+            self._age_confidence(recommendation, now_ts),
+            self._size_impact(recommendation),
+            self._access_confidence(recommendation),
+        )
 
-        if access_confidence >= 70:
-            factors.append("Access pattern signal is strong.")
-        else:
-            factors.append("Access pattern signal is limited.")
+    def _build_factor_scores(
+        self,
+        reversibility: int,
+        data_loss_risk: int,
+        age_confidence: int,
+        size_impact: int,
+        access_confidence: int,
+    ) -> tuple[RiskFactorScores, list[str]]:
+        # Each factor message is picked by how many of its thresholds the score meets.
+        factors = [
+            _REVERSIBILITY_MESSAGES[(reversibility >= 50) + (reversibility >= 80)],
+            _DATA_LOSS_MESSAGES[(data_loss_risk >= 35) + (data_loss_risk >= 70)],
+            _AGE_MESSAGES[(age_confidence >= 50) + (age_confidence >= 80)],
+            _SIZE_MESSAGES[(size_impact >= 40) + (size_impact >= 70)],
+            _ACCESS_MESSAGES[access_confidence >= 70],
+        ]
 
         return (
-            RiskFactorScores(
+            RiskFactorScores.model_construct(
                 reversibility=reversibility,
                 data_loss_risk=data_loss_risk,
                 age_confidence=age_confidence,
@@ -176,15 +280,7 @@ class ScoringService:
         return max(0, min(100, confidence))
 
     def _calculate_impact_score(self, monthly_savings: float) -> int:
-        if monthly_savings >= 100:
-            return 100
-        if monthly_savings >= 50:
-            return 80
-        if monthly_savings >= 10:
-            return 60
-        if monthly_savings >= 1:
-            return 40
-        return 20
+        return _IMPACT_SCORES[bisect_right(_IMPACT_THRESHOLDS, monthly_savings)]
 
     def _risk_level_from_score(self, risk_score: int) -> RiskLevel:
         if risk_score < 30:
@@ -211,63 +307,30 @@ class ScoringService:
         return "Include in validated execution batch."
 
     def _data_loss_risk(self, recommendation: Recommendation) -> int:
-        if recommendation.recommendation_type == RecommendationType.DELETE_STALE_OBJECT:
-            return 100
-        if recommendation.recommendation_type == RecommendationType.DELETE_INCOMPLETE_UPLOAD:
-            return 10
-        if recommendation.recommendation_type == RecommendationType.CHANGE_STORAGE_CLASS:
-            return 5
-        return 0
-
-    def _age_confidence(self, recommendation: Recommendation) -> int:
+        return self.DATA_LOSS_RISK.get(recommendation.recommendation_type, 0)
+
+    def _age_confidence(self, recommendation: Recommendation, now_ts: float | None = None) -> int:
         if recommendation.last_modified is None:
             return 35
 
-        now = datetime.now(timezone.utc)
-        days_old = (now - recommendation.last_modified).days
-        if days_old >= 365:
-            return 95
-        if days_old >= 180:
-            return 80
-        if days_old >= 90:
-            return 65
-        if days_old >= 30:
-            return 45
-        return 25
+        if now_ts is None:
+            now_ts = datetime.now(timezone.utc).timestamp()
+        # Same as (now - last_modified).days, without building a timedelta.
+        days_old = int((now_ts - recommendation.last_modified.timestamp()) // _SECONDS_PER_DAY)
+        return _AGE_SCORES[bisect_right(_AGE_THRESHOLDS_DAYS, days_old)]
 
     def _size_impact(self, recommendation: Recommendation) -> int:
-        size_gb = recommendation.size_bytes / (1024 ** 3)
-        if size_gb >= 100:
-            return 100
-        if size_gb >= 10:
-            return 80
-        if size_gb >= 1:
-            return 60
-        if size_gb >= 0.1:
-            return 35
-        return 15
+        return _SIZE_SCORES[bisect_right(_SIZE_THRESHOLDS_BYTES, recommendation.size_bytes)]
 
     def _access_confidence(self, recommendation: Recommendation) -> int:
         base = 50 if recommendation.last_modified is not None else 35
-        reason = recommendation.reason.lower()
-        if "infrequent" in reason or "cold" in reason or "stale" in reason:
+        if _COLD_HINT_RE.search(recommendation.reason):
             base += 10
         return min(100, base)
 
-    def _calculate_savings(self, recommendation: Recommendation) -> SavingsEstimate:
-        if recommendation.recommendation_type == RecommendationType.CHANGE_STORAGE_CLASS:
-            return self._storage_class_savings(recommendation)
-        if recommendation.recommendation_type == RecommendationType.ADD_LIFECYCLE_POLICY:
-            return self._lifecycle_savings(recommendation)
-        if recommendation.recommendation_type == RecommendationType.DELETE_INCOMPLETE_UPLOAD:
-            return self._multipart_savings(recommendation)
-        if recommendation.recommendation_type == RecommendationType.DELETE_STALE_OBJECT:
-            return self._deletion_savings(recommendation)
-        return self._fallback_savings(recommendation)
-
     def _storage_class_savings(self, recommendation: Recommendation) -> SavingsEstimate:
         assumptions: list[str] = []
-        size_gb = recommendation.size_bytes / (1024 ** 3)
+        size_gb = recommendation.size_bytes / _GB
         current_class = recommendation.storage_class.value if recommendation.storage_class else "STANDARD"
         if recommendation.target_storage_class is not None:
             target_class = recommendation.target_storage_class.value
@@ -275,17 +338,13 @@ class ScoringService:
             target_class = self._parse_target_class(recommendation.recommended_action)
 
         current_rate = self.STORAGE_PRICING.get(current_class, self.STORAGE_PRICING["STANDARD"])
-        target_rate = self.STORAGE_PRICING.get(target_class, self.STORAGE_PRICING["GLACIER_IR"])
+        target_rate, transition_cost, duration_months, duration_note = self._target_profile(target_class)
 
         current_monthly = size_gb * current_rate
         projected_monthly = size_gb * target_rate
         monthly_savings = max(0.0, current_monthly - projected_monthly)
 
-        transition_rate = self.TRANSITION_COSTS.get(target_class, 0.02)
-        transition_cost = transition_rate / 1000
-
-        min_days = self.MIN_STORAGE_DURATION.get(target_class, 0)
-        minimum_duration_risk = projected_monthly * (min_days / 30) if min_days else 0.0
+        minimum_duration_risk = projected_monthly * duration_months if duration_months else 0.0
 
         net_first_month = monthly_savings - transition_cost
         net_annual = (monthly_savings * 12) - transition_cost
@@ -296,14 +355,14 @@ class ScoringService:
 
         assumptions.append(f"Transition {current_class} -> {target_class}")
         assumptions.append(f"Object size {size_gb:.2f} GB")
-        if min_days:
-            assumptions.append(f"Minimum storage duration {min_days} days")
+        if duration_note:
+            assumptions.append(duration_note)
 
         confidence = "high" if recommendation.last_modified and recommendation.size_bytes > 0 else "medium"
         if recommendation.size_bytes == 0:
             confidence = "low"
 
-        return SavingsEstimate(
+        return SavingsEstimate.model_construct(
             recommendation_id=recommendation.id,
             current_monthly_cost=current_monthly,
             projected_monthly_cost=projected_monthly,
@@ -317,8 +376,29 @@ class ScoringService:
             assumptions=assumptions,
         )
 
+    def _target_profile(self, target_class: str) -> tuple[float, float, float, str | None]:
+        """(storage rate, transition cost, minimum-duration months, duration note) for a target."""
+        profile = self._target_profiles.get(target_class)
+        if profile is None:
+            profile = self._target_profiles[target_class] = self._build_target_profile(target_class)
+        return profile
+
+    @functools.cached_property
+    def _target_profiles(self) -> dict[str, tuple[float, float, float, str | None]]:
+        # Everything _storage_class_savings needs about a target class depends
+        # on the pricing tables alone, so it is worked out once per class.
+        return {target.value: self._build_target_profile(target.value) for target in StorageClass}
+
+    def _build_target_profile(self, target_class: str) -> tuple[float, float, float, str | None]:
+        target_rate = self.STORAGE_PRICING.get(target_class, self.STORAGE_PRICING["GLACIER_IR"])
+        transition_cost = self.TRANSITION_COSTS.get(target_class, 0.02) / 1000
+        min_days = self.MIN_STORAGE_DURATION.get(target_class, 0)
+        if not min_days:
+            return target_rate, transition_cost, 0.0, None
+        return target_rate, transition_cost, min_days / 30, f"Minimum storage duration {min_days} days"
+
     def _lifecycle_savings(self, recommendation: Recommendation) -> SavingsEstimate:
-        size_gb = recommendation.size_bytes / (1024 ** 3)
+        size_gb = recommendation.size_bytes / _GB
         baseline = recommendation.estimated_monthly_savings if recommendation.estimated_monthly_savings > 0 else 0.5
 
         if size_gb > 0:
@@ -330,7 +410,7 @@ class ScoringService:
             monthly_savings = baseline
             projected_monthly = max(0.0, current_monthly - monthly_savings)
 
-        return SavingsEstimate(
+        return SavingsEstimate.model_construct(
             recommendation_id=recommendation.id,
             current_monthly_cost=current_monthly,
             projected_monthly_cost=projected_monthly,
@@ -349,12 +429,12 @@ class ScoringService:
 
     def _multipart_savings(self, recommendation: Recommendation) -> SavingsEstimate:
         if recommendation.size_bytes > 0:
-            size_gb = recommendation.size_bytes / (1024 ** 3)
+            size_gb = recommendation.size_bytes / _GB
             current_monthly = size_gb * self.STORAGE_PRICING["STANDARD"]
         else:
             current_monthly = max(0.01, recommendation.estimated_monthly_savings)
 
-        return SavingsEstimate(
+        return SavingsEstimate.model_construct(
             recommendation_id=recommendation.id,
             current_monthly_cost=current_monthly,
             projected_monthly_cost=0.0,
@@ -372,15 +452,15 @@ class ScoringService:
         )
 
     def _deletion_savings(self, recommendation: Recommendation) -> SavingsEstimate:
-        size_gb = recommendation.size_bytes / (1024 ** 3)
-        storage_class = (recommendation.storage_class or "STANDARD").upper()
+        size_gb = recommendation.size_bytes / _GB
+        storage_class = _normalize_storage_class(recommendation.storage_class)
         rate = self.STORAGE_PRICING.get(storage_class, self.STORAGE_PRICING["STANDARD"])
 
         current_monthly = size_gb * rate
         if current_monthly <= 0:
             current_monthly = recommendation.estimated_monthly_savings
 
-        return SavingsEstimate(
+        return SavingsEstimate.model_construct(
             recommendation_id=recommendation.id,
             current_monthly_cost=current_monthly,
             projected_monthly_cost=0.0,
@@ -399,7 +479,7 @@ class ScoringService:
 
     def _fallback_savings(self, recommendation: Recommendation) -> SavingsEstimate:
         monthly = recommendation.estimated_monthly_savings
-        return SavingsEstimate(
+        return SavingsEstimate.model_construct(
             recommendation_id=recommendation.id,
             current_monthly_cost=monthly,
             projected_monthly_cost=0.0,
@@ -413,34 +493,35 @@ class ScoringService:
             assumptions=["Fallback estimate using recommendation baseline."],
         )
 
+    # Savings estimator per recommendation type; anything else uses _fallback_savings.
+    SAVINGS_CALCULATORS = {
+        RecommendationType.CHANGE_STORAGE_CLASS: _storage_class_savings,
+        RecommendationType.ADD_LIFECYCLE_POLICY: _lifecycle_savings,
+        RecommendationType.DELETE_INCOMPLETE_UPLOAD: _multipart_savings,
+        RecommendationType.DELETE_STALE_OBJECT: _deletion_savings,
+    }
+
     def _aggregate_savings(self, estimates: list[SavingsEstimate]) -> SavingsSummary:
-        high = len([item for item in estimates if item.estimate_confidence == "high"])
-        medium = len([item for item in estimates if item.estimate_confidence == "medium"])
-        low = len([item for item in estimates if item.estimate_confidence == "low"])
-
-        return SavingsSummary(
-            total_monthly_savings=sum(item.monthly_savings for item in estimates),
-            total_annual_savings=sum(item.net_annual_savings for item in estimates),
-            total_transition_costs=sum(item.transition_cost for item in estimates),
-            net_first_month=sum(item.net_first_month for item in estimates),
-            high_confidence_count=high,
-            medium_confidence_count=medium,
-            low_confidence_count=low,
+        # One pass over the estimates for every total and count.
+        monthly = annual = transition = first_month = 0.0
+        counts = {"high": 0, "medium": 0, "low": 0}
+        for item in estimates:
+            monthly += item.monthly_savings
+            annual += item.net_annual_savings
+            transition += item.transition_cost
+            first_month += item.net_first_month
+            if item.estimate_confidence in counts:
+                counts[item.estimate_confidence] += 1
+
+        return SavingsSummary.model_construct(
+            total_monthly_savings=monthly,
+            total_annual_savings=annual,
+            total_transition_costs=transition,
+            net_first_month=first_month,
+            high_confidence_count=counts["high"],
+            medium_confidence_count=counts["medium"],
+            low_confidence_count=counts["low"],
         )
 
     def _parse_target_class(self, action: str) -> str:
-        normalized = action.lower().replace("-", "_")
-        if "deep_archive" in normalized:
-            return "DEEP_ARCHIVE"
-        if "glacier_ir" in normalized:
-            return "GLACIER_IR"
-        if "glacier" in normalized:
-            return "GLACIER"
-        if "intelligent" in normalized:
-            return "INTELLIGENT_TIERING"
-        if "onezone" in normalized:
-            return "ONEZONE_IA"
-        if "standard_ia" in normalized:
-            return "STANDARD_IA"
-        return "GLACIER_IR"
-
+        return _parse_target_class(action)
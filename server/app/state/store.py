@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+from contextlib import closing
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+import functools
+from itertools import islice
 import json
 from pathlib import Path
+import secrets
 import sqlite3
-from threading import Lock
-from typing import Optional
-import uuid
+from threading import local
+from typing import Iterator, Optional
+
+from pydantic import TypeAdapter
 
 from app.models import (
     ExecuteResponse,
@@ -17,12 +22,74 @@ from app.models import (
     RollbackStatus,
     RiskScore,
     RunStatus,
+    RunSummary,
     SavingsEstimate,
     SavingsSummary,
 )
 
+# Applied to every connection. With WAL, synchronous=NORMAL only syncs at
+# checkpoints: a power loss can drop the last commits but never corrupts the
+# file. cache_size is in KiB when negative.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-8192",
+)
+
+# Writers are serialized by SQLite's write lock rather than a Python lock; a
+# writer that finds it held retries for this long before raising "locked".
+_BUSY_TIMEOUT_SECONDS = 5.0
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model_type: type) -> TypeAdapter:
+    # Building an adapter compiles a schema; do it once per model type. Used
+    # in both directions so JSON never round-trips through Python dicts.
+    return TypeAdapter(list[model_type])
+
+
+_AUDIT_SELECT_SQL = """
+    SELECT
+        audit_id,
+        execution_id,
+        run_id,
+        recommendation_id,
+        recommendation_type,
+        bucket,
+        key,
+        action_status,
+        message,
+        risk_level,
+        requires_approval,
+        permitted,
+        required_permissions_json,
+        missing_permissions_json,
+        simulated,
+        pre_change_state_json,
+        post_change_state_json,
+        rollback_available,
+        rollback_status,
+        rolled_back_at,
+        created_at
+    FROM execution_audit
+    WHERE run_id = ?
+"""
+
 
-@dataclass
+@functools.lru_cache(maxsize=None)
+def _audit_query(by_execution: bool, by_audit_ids: bool) -> str:
+    # Audit IDs are bound as one JSON array, so the statement text does not
+    # depend on how many there are and sqlite3's statement cache stays warm.
+    query = _AUDIT_SELECT_SQL
+    if by_execution:
+        query += " AND execution_id = ?"
+    if by_audit_ids:
+        query += " AND audit_id IN (SELECT value FROM json_each(?))"
+    # Rows of one execution share created_at; rowid keeps them newest first.
+    return query + " ORDER BY created_at DESC, rowid DESC"
+
+
+@dataclass(slots=True)
 class RunRecord:
     run_id: str
     status: RunStatus
@@ -36,51 +103,52 @@ class RunRecord:
 
 
 class RunStore:
-    def __init__(self, db_path: str = "data/runs.db") -> None:
-        self._lock = Lock()
+    def __init__(self, db_path: str = "data/runs.db", audit_batch_size: int = 500) -> None:
+        self._local = local()
+        self._audit_batch_size = max(1, audit_batch_size)
         self._db_path = Path(db_path)
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
         self._initialize()
 
     def create(self, recommendations: list[Recommendation]) -> RunRecord:
-        with self._lock:
-            run_id = str(uuid.uuid4())
-            now = datetime.now(timezone.utc)
-            record = RunRecord(
-                run_id=run_id,
-                status=RunStatus.SCANNED,
-                recommendations=recommendations,
-                created_at=now,
-                updated_at=now,
+        # Drawn from os.urandom like uuid4, without building a UUID object.
+        run_id = secrets.token_hex(16)
+        now = datetime.now(timezone.utc)
+        record = RunRecord(
+            run_id=run_id,
+            status=RunStatus.SCANNED,
+            recommendations=recommendations,
+            created_at=now,
+            updated_at=now,
+        )
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO runs (
+                    run_id,
+                    status,
+                    recommendations_json,
+                    scores_json,
+                    savings_details_json,
+                    savings_summary_json,
+                    execution_json,
+                    created_at,
+                    updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    record.run_id,
+                    record.status.value,
+                    self._serialize_models(record.recommendations, Recommendation),
+                    self._serialize_models(record.scores, RiskScore),
+                    self._serialize_models(record.savings_details, SavingsEstimate),
+                    self._serialize_model(record.savings_summary),
+                    self._serialize_model(record.execution),
+                    record.created_at.isoformat(),
+                    record.updated_at.isoformat(),
+                ),
             )
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO runs (
-                        run_id,
-                        status,
-                        recommendations_json,
-                        scores_json,
-                        savings_details_json,
-                        savings_summary_json,
-                        execution_json,
-                        created_at,
-                        updated_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (
-                        record.run_id,
-                        record.status.value,
-                        self._serialize_models(record.recommendations),
-                        self._serialize_models(record.scores),
-                        self._serialize_models(record.savings_details),
-                        self._serialize_model(record.savings_summary),
-                        self._serialize_model(record.execution),
-                        record.created_at.isoformat(),
-                        record.updated_at.isoformat(),
-                    ),
-                )
-            return record
+        return record
 
     def get(self, run_id: str) -> Optional[RunRecord]:
         with self._connect() as conn:
@@ -104,8 +172,16 @@ class RunStore:
         return self._row_to_record(row) if row else None
 
     def list(self) -> list[RunRecord]:
+        return list(self.iter_runs())
+
+    def iter_runs(self, chunk_size: int = 256) -> Iterator[RunRecord]:
+        """Yield runs newest first, decoding one chunk of rows at a time.
+
+        Only ``chunk_size`` rows are buffered, so callers that stream never hold
+        every decoded run at once; list() is the collecting wrapper.
+        """
         with self._connect() as conn:
-            rows = conn.execute(
+            cursor = conn.execute(
                 """
                 SELECT
                     run_id,
@@ -120,9 +196,44 @@ class RunStore:
                 FROM runs
                 ORDER BY updated_at DESC
                 """
+            )
+            while rows := cursor.fetchmany(chunk_size):
+                for row in rows:
+                    yield self._row_to_record(row)
+
+    def list_summaries(self) -> list[RunSummary]:
+        # The count and savings total are read out of the JSON columns by
+        # SQLite, so listing runs never decodes the recommendation payloads.
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT
+                    run_id,
+                    status,
+                    json_array_length(recommendations_json) AS recommendation_count,
+                    COALESCE(
+                        json_extract(savings_summary_json, '$.total_monthly_savings'),
+                        (
+                            SELECT TOTAL(json_extract(value, '$.estimated_monthly_savings'))
+                            FROM json_each(recommendations_json)
+                        )
+                    ) AS estimated_monthly_savings,
+                    updated_at
+                FROM runs
+                ORDER BY updated_at DESC
+                """
             ).fetchall()
 
-        return [self._row_to_record(row) for row in rows]
+        return [
+            RunSummary(
+                run_id=row["run_id"],
+                status=RunStatus(row["status"]),
+                recommendation_count=row["recommendation_count"],
+                estimated_monthly_savings=row["estimated_monthly_savings"],
+                updated_at=datetime.fromisoformat(row["updated_at"]),
+            )
+            for row in rows
+        ]
 
     def set_scores(
         self,
@@ -131,65 +242,91 @@ class RunStore:
         savings_details: list[SavingsEstimate],
         savings_summary: SavingsSummary,
     ) -> Optional[RunRecord]:
-        with self._lock:
-            record = self.get(run_id)
-            if not record:
-                return None
-            record.scores = scores
-            record.savings_details = savings_details
-            record.savings_summary = savings_summary
-            record.status = RunStatus.SCORED
-            record.updated_at = datetime.now(timezone.utc)
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    UPDATE runs
-                    SET
-                        status = ?,
-                        scores_json = ?,
-                        savings_details_json = ?,
-                        savings_summary_json = ?,
-                        updated_at = ?
-                    WHERE run_id = ?
-                    """,
-                    (
-                        record.status.value,
-                        self._serialize_models(record.scores),
-                        self._serialize_models(record.savings_details),
-                        self._serialize_model(record.savings_summary),
-                        record.updated_at.isoformat(),
-                        run_id,
-                    ),
-                )
-            return record
+        updated_at = datetime.now(timezone.utc)
+        with self._connect() as conn:
+            # RETURNING hands back only the columns this update leaves
+            # alone, so the replaced JSON is never read and decoded.
+            rows = conn.execute(
+                """
+                UPDATE runs
+                SET
+                    status = ?,
+                    scores_json = ?,
+                    savings_details_json = ?,
+                    savings_summary_json = ?,
+                    updated_at = ?
+                WHERE run_id = ?
+                RETURNING recommendations_json, execution_json, created_at
+                """,
+                (
+                    RunStatus.SCORED.value,
+                    self._serialize_models(scores, RiskScore),
+                    self._serialize_models(savings_details, SavingsEstimate),
+                    self._serialize_model(savings_summary),
+                    updated_at.isoformat(),
+                    run_id,
+                ),
+            ).fetchall()
+        if not rows:
+            return None
+        row = rows[0]
+        return RunRecord(
+            run_id=run_id,
+            status=RunStatus.SCORED,
+            recommendations=self._deserialize_models(row["recommendations_json"], Recommendation),
+            scores=scores,
+            savings_details=savings_details,
+            savings_summary=savings_summary,
+            execution=self._deserialize_model(row["execution_json"], ExecuteResponse),
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=updated_at,
+        )
 
     def set_execution(self, run_id: str, execution: ExecuteResponse) -> Optional[RunRecord]:
-        with self._lock:
-            record = self.get(run_id)
-            if not record:
+        updated_at = datetime.now(timezone.utc)
+        now_iso = updated_at.isoformat()
+        with self._connect() as conn:
+            # The run update and its audit rows commit together.
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                """
+                UPDATE runs
+                SET
+                    status = ?,
+                    execution_json = ?,
+                    updated_at = ?
+                WHERE run_id = ?
+                RETURNING
+                    recommendations_json,
+                    scores_json,
+                    savings_details_json,
+                    savings_summary_json,
+                    created_at
+                """,
+                (
+                    RunStatus.EXECUTED.value,
+                    self._serialize_model(execution),
+                    now_iso,
+                    run_id,
+                ),
+            ).fetchall()
+            if not rows:
                 return None
-            record.execution = execution
-            record.status = RunStatus.EXECUTED
-            record.updated_at = datetime.now(timezone.utc)
-            with self._connect() as conn:
-                conn.execute(
-                    """
-                    UPDATE runs
-                    SET
-                        status = ?,
-                        execution_json = ?,
-                        updated_at = ?
-                    WHERE run_id = ?
-                    """,
-                    (
-                        record.status.value,
-                        self._serialize_model(record.execution),
-                        record.updated_at.isoformat(),
-                        run_id,
-                    ),
-                )
-                self._insert_execution_audit(conn, run_id, execution.execution_id, execution.action_results)
-            return record
+            self._insert_execution_audit(
+                conn, run_id, execution.execution_id, execution.action_results, now_iso
+            )
+        row = rows[0]
+        return RunRecord(
+            run_id=run_id,
+            status=RunStatus.EXECUTED,
+            recommendations=self._deserialize_models(row["recommendations_json"], Recommendation),
+            scores=self._deserialize_models(row["scores_json"], RiskScore),
+            savings_details=self._deserialize_models(row["savings_details_json"], SavingsEstimate),
+            savings_summary=self._deserialize_model(row["savings_summary_json"], SavingsSummary),
+            execution=execution,
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=updated_at,
+        )
 
     def list_execution_audit(
         self,
@@ -197,44 +334,12 @@ class RunStore:
         execution_id: Optional[str] = None,
         audit_ids: Optional[list[str]] = None,
     ) -> list[ExecutionAuditRecord]:
-        query = """
-            SELECT
-                audit_id,
-                execution_id,
-                run_id,
-                recommendation_id,
-                recommendation_type,
-                bucket,
-                key,
-                action_status,
-                message,
-                risk_level,
-                requires_approval,
-                permitted,
-                required_permissions_json,
-                missing_permissions_json,
-                simulated,
-                pre_change_state_json,
-                post_change_state_json,
-                rollback_available,
-                rollback_status,
-                rolled_back_at,
-                created_at
-            FROM execution_audit
-            WHERE run_id = ?
-        """
         params: list = [run_id]
-
         if execution_id:
-            query += " AND execution_id = ?"
             params.append(execution_id)
-
         if audit_ids:
-            placeholders = ",".join(["?"] * len(audit_ids))
-            query += f" AND audit_id IN ({placeholders})"
-            params.extend(audit_ids)
-
-        query += " ORDER BY created_at DESC"
+            params.append(json.dumps(audit_ids))
+        query = _audit_query(bool(execution_id), bool(audit_ids))
 
         with self._connect() as conn:
             rows = conn.execute(query, params).fetchall()
@@ -246,38 +351,47 @@ class RunStore:
         rollback_status: RollbackStatus,
         message: Optional[str] = None,
     ) -> bool:
-        with self._lock:
-            rolled_back_at = datetime.now(timezone.utc).isoformat() if rollback_status == RollbackStatus.ROLLED_BACK else None
-            with self._connect() as conn:
-                run_row = conn.execute(
-                    "SELECT run_id FROM execution_audit WHERE audit_id = ?",
-                    (audit_id,),
-                ).fetchone()
-                cursor = conn.execute(
-                    """
-                    UPDATE execution_audit
-                    SET
-                        rollback_status = ?,
-                        rolled_back_at = COALESCE(?, rolled_back_at),
-                        message = COALESCE(?, message)
-                    WHERE audit_id = ?
-                    """,
-                    (
-                        rollback_status.value,
-                        rolled_back_at,
-                        message,
-                        audit_id,
-                    ),
+        now_iso = datetime.now(timezone.utc).isoformat()
+        rolled_back_at = now_iso if rollback_status == RollbackStatus.ROLLED_BACK else None
+        with self._connect() as conn:
+            # Take the write lock up front so no other writer can change the
+            # audit row between the lookup and the updates.
+            conn.execute("BEGIN IMMEDIATE")
+            run_row = conn.execute(
+                "SELECT run_id FROM execution_audit WHERE audit_id = ?",
+                (audit_id,),
+            ).fetchone()
+            cursor = conn.execute(
+                """
+                UPDATE execution_audit
+                SET
+                    rollback_status = ?,
+                    rolled_back_at = COALESCE(?, rolled_back_at),
+                    message = COALESCE(?, message)
+                WHERE audit_id = ?
+                """,
+                (
+                    rollback_status.value,
+                    rolled_back_at,
+                    message,
+                    audit_id,
+                ),
+            )
+            if cursor.rowcount > 0 and run_row:
+                conn.execute(
+                    "UPDATE runs SET updated_at = ? WHERE run_id = ?",
+                    (now_iso, run_row["run_id"]),
                 )
-                if cursor.rowcount > 0 and run_row:
-                    conn.execute(
-                        "UPDATE runs SET updated_at = ? WHERE run_id = ?",
-                        (datetime.now(timezone.utc).isoformat(), run_row["run_id"]),
-                    )
-                return cursor.rowcount > 0
+            return cursor.rowcount > 0
 
     def _initialize(self) -> None:
-        with self._connect() as conn:
+        # A throwaway connection: the constructing thread may never use the
+        # store again, and a forked worker must not inherit a cached handle.
+        with closing(self._open_connection()) as conn, conn:
+            # WAL lets status polls read while a run is being written; the
+            # setting is stored in the database file, so it only needs to be
+            # applied once.
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS runs (
@@ -339,10 +453,39 @@ class RunStore:
                 ON execution_audit(execution_id)
                 """
             )
+            # Serves the run + execution filter of list_execution_audit;
+            # scanned backwards it already yields created_at DESC, rowid DESC,
+            # so no sort step is needed. Kept in step with Alembic revision 0002.
+            conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_execution_audit_run_execution
+                ON execution_audit(run_id, execution_id, created_at)
+                """
+            )
 
     def _connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self._db_path)
+        """This thread's connection, opened on first use and reused afterwards.
+
+        sqlite3 connections may only be used by the thread that opened them,
+        so each thread keeps its own; ``with conn:`` still scopes a transaction.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = self._open_connection()
+        return conn
+
+    def close(self) -> None:
+        """Close the calling thread's cached connection, if it has one."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            conn.close()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self._db_path, timeout=_BUSY_TIMEOUT_SECONDS)
         conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
 
     def _row_to_record(self, row: sqlite3.Row) -> RunRecord:
@@ -364,24 +507,26 @@ class RunStore:
             updated_at=datetime.fromisoformat(row["updated_at"]),
         )
 
-    def _serialize_models(self, data: list) -> str:
-        return json.dumps([item.model_dump(mode="json") for item in data])
+    def _serialize_models(self, data: list, model_type) -> str:
+        # pydantic-core writes the JSON directly; no intermediate dicts.
+        return _list_adapter(model_type).dump_json(data).decode()
 
     def _serialize_model(self, data) -> Optional[str]:
         if data is None:
             return None
-        return json.dumps(data.model_dump(mode="json"))
+        return data.model_dump_json()
 
     def _deserialize_models(self, payload: str, model_type):
         if not payload:
             return []
-        raw_items = json.loads(payload)
-        return [model_type.model_validate(item) for item in raw_items]
+        # Still validated rather than model_construct'ed: the model validators
+        # upgrade rows written by older versions of the schema.
+        return _list_adapter(model_type).validate_json(payload)
 
     def _deserialize_model(self, payload: Optional[str], model_type):
         if not payload:
             return None
-        return model_type.model_validate(json.loads(payload))
+        return model_type.model_validate_json(payload)
 
     def _insert_execution_audit(
         self,
@@ -389,11 +534,42 @@ class RunStore:
         run_id: str,
         execution_id: str,
         action_results: list[ExecutionActionResult],
+        created_at: str,
     ) -> None:
-        for action in action_results:
-            conn.execute(
+        rows = (
+            (
+                action.audit_id,
+                execution_id,
+                run_id,
+                action.recommendation_id,
+                action.recommendation_type.value,
+                action.bucket,
+                action.key,
+                action.status.value,
+                action.message,
+                action.risk_level.value,
+                int(action.requires_approval),
+                int(action.permitted),
+                json.dumps(action.required_permissions),
+                json.dumps(action.missing_permissions),
+                int(action.simulated),
+                json.dumps(action.pre_change_state),
+                json.dumps(action.post_change_state) if action.post_change_state is not None else None,
+                int(action.rollback_available),
+                action.rollback_status.value,
+                None,
+                created_at,
+            )
+            for action in action_results
+        )
+        # Flush in fixed-size batches so large executions are written with a
+        # handful of executemany calls without materializing every row tuple.
+        # Audit IDs are unique per execution; a duplicate is a bug upstream,
+        # so it raises and rolls back the whole execution write.
+        while batch := list(islice(rows, self._audit_batch_size)):
+            conn.executemany(
                 """
-                INSERT OR REPLACE INTO execution_audit (
+                INSERT INTO execution_audit (
                     audit_id,
                     execution_id,
                     run_id,
@@ -417,29 +593,7 @@ class RunStore:
                     created_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    action.audit_id,
-                    execution_id,
-                    run_id,
-                    action.recommendation_id,
-                    action.recommendation_type.value,
-                    action.bucket,
-                    action.key,
-                    action.status.value,
-                    action.message,
-                    action.risk_level.value,
-                    int(action.requires_approval),
-                    int(action.permitted),
-                    json.dumps(action.required_permissions),
-                    json.dumps(action.missing_permissions),
-                    int(action.simulated),
-                    json.dumps(action.pre_change_state),
-                    json.dumps(action.post_change_state) if action.post_change_state is not None else None,
-                    int(action.rollback_available),
-                    action.rollback_status.value,
-                    None,
-                    datetime.now(timezone.utc).isoformat(),
-                ),
+                batch,
             )
 
     def _row_to_audit_record(self, row: sqlite3.Row) -> ExecutionAuditRecord:
@@ -20,6 +20,29 @@ class TestHealthEndpoint:
         assert "timestamp" in body
 
 
+@pytest.mark.integration
+class TestCorsPreflight:
+    def _preflight(self, client, headers):
+        return client.options(
+            "/api/v1/optimizer/execute",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST",
+                "Access-Control-Request-Headers": headers,
+            },
+        )
+
+    def test_preflight_allows_json_post(self, client):
+        resp = self._preflight(client, "content-type")
+        assert resp.status_code == 200
+        assert "POST" in resp.headers["access-control-allow-methods"]
+        assert "content-type" in resp.headers["access-control-allow-headers"]
+
+    def test_preflight_rejects_unlisted_header(self, client):
+        resp = self._preflight(client, "x-custom-header")
+        assert resp.status_code == 400
+
+
 @pytest.mark.integration
 class TestMalformedRequests:
     def test_scan_max_objects_below_1_returns_422(self, client):
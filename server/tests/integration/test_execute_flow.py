@@ -1,5 +1,7 @@
 """Integration tests for POST /api/v1/optimizer/execute."""
 
+import json
+
 import pytest
 
 
@@ -82,6 +84,16 @@ class TestExecuteEndpoint:
         assert body["dry_run"] is False
         assert body["executed"] > 0
 
+    def test_rescan_after_live_execute_sees_new_lifecycle_policy(self, client):
+        run_id = _scan_and_score(client, buckets=["test-bucket"])
+        client.post(
+            "/api/v1/optimizer/execute",
+            json={"run_id": run_id, "mode": "full", "dry_run": False},
+        )
+        rescan = client.post("/api/v1/optimizer/scan", json={"include_buckets": ["test-bucket"]}).json()
+        types = {rec["recommendation_type"] for rec in rescan["recommendations"]}
+        assert "add_lifecycle_policy" not in types
+
     def test_execute_response_counts_are_consistent(self, client):
         run_id = _scan_and_score(client)
         body = client.post(
@@ -106,3 +118,40 @@ class TestExecuteEndpoint:
             json={"run_id": run_id, "mode": "dry_run", "max_actions": 99999},
         )
         assert resp.status_code == 422
+
+
+@pytest.mark.integration
+class TestExecuteStreamEndpoint:
+    def test_stream_emits_results_then_summary(self, client):
+        run_id = _scan_and_score(client)
+        resp = client.post(
+            "/api/v1/optimizer/execute/stream",
+            json={"run_id": run_id, "mode": "dry_run"},
+        )
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+        *results, summary = [json.loads(line) for line in resp.text.splitlines()]
+        assert "action_results" not in summary
+        assert summary["run_id"] == run_id
+        total = summary["executed"] + summary["skipped"] + summary["blocked"] + summary["failed"]
+        assert total == len(results)
+        assert all("audit_id" in result for result in results)
+
+    def test_stream_persists_execution(self, client):
+        run_id = _scan_and_score(client)
+        client.post(
+            "/api/v1/optimizer/execute/stream",
+            json={"run_id": run_id, "mode": "dry_run"},
+        )
+        run = client.get(f"/api/v1/optimizer/runs/{run_id}").json()
+        assert run["status"] == "executed"
+        assert len(run["audit_records"]) > 0
+
+    def test_stream_before_score_returns_409(self, client):
+        run_id = client.post("/api/v1/optimizer/scan", json={}).json()["run_id"]
+        resp = client.post(
+            "/api/v1/optimizer/execute/stream",
+            json={"run_id": run_id, "mode": "dry_run"},
+        )
+        assert resp.status_code == 409
@@ -0,0 +1,22 @@
+"""Unit tests for the shared S3 client factory."""
+
+import pytest
+
+from app.core.aws import S3_CLIENT_CONFIG, get_s3_client
+
+
+@pytest.mark.unit
+class TestGetS3Client:
+    def test_same_region_returns_same_client(self):
+        assert get_s3_client("us-east-1") is get_s3_client("us-east-1")
+
+    def test_regions_get_separate_clients(self):
+        east = get_s3_client("us-east-1")
+        west = get_s3_client("us-west-2")
+        assert east is not west
+        assert west.meta.region_name == "us-west-2"
+
+    def test_client_uses_shared_config(self):
+        config = get_s3_client("us-east-1").meta.config
+        assert config.retries["mode"] == S3_CLIENT_CONFIG.retries["mode"]
+        assert config.max_pool_connections == S3_CLIENT_CONFIG.max_pool_connections
@@ -0,0 +1,53 @@
+"""Unit tests for the TTLCache helper."""
+
+import pytest
+
+from app.core import cache as cache_module
+from app.core.cache import TTLCache
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    """Controllable replacement for time.monotonic inside app.core.cache."""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+@pytest.mark.unit
+class TestTTLCache:
+    def test_get_missing_returns_default(self):
+        assert TTLCache(maxsize=2, ttl=10).get("missing", "fallback") == "fallback"
+
+    def test_set_then_get(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+
+    def test_entry_expires_after_ttl(self, clock):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        clock[0] += 9.9
+        assert cache.get("a") == 1
+        clock[0] += 0.1
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_evicted(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_pop_and_clear(self):
+        cache = TTLCache(maxsize=4, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        assert cache.pop("a") == 1
+        assert cache.pop("a", "gone") == "gone"
+        cache.clear()
+        assert len(cache) == 0
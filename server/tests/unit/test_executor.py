@@ -399,6 +399,12 @@ class TestChangeState:
         state = resp.action_results[0].post_change_state
         assert state["action"] == "add_lifecycle_policy"
 
+    def test_post_change_state_target_is_storage_class(self):
+        rec = _rec(target_storage_class=StorageClass.DEEP_ARCHIVE)
+        score = _score(rec.id)
+        resp = _execute([rec], [score], _req(mode=ExecutionMode.DRY_RUN))
+        assert resp.action_results[0].post_change_state["target"] == "DEEP_ARCHIVE"
+
 
 # ---------------------------------------------------------------------------
 # Response count integrity
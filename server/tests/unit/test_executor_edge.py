@@ -1,11 +1,15 @@
 """Edge-case unit tests for ExecutionService — supplements test_executor.py."""
 
+import asyncio
 import uuid
+from datetime import datetime, timedelta, timezone
 import pytest
+from pydantic import ValidationError
 
 from app.executor.service import ExecutionService
 from app.models import (
     ExecuteRequest,
+    ExecuteResponse,
     ExecutionActionStatus,
     ExecutionMode,
     Recommendation,
@@ -13,6 +17,7 @@ from app.models import (
     RiskFactorScores,
     RiskLevel,
     RiskScore,
+    RollbackStatus,
     StorageClass,
 )
 
@@ -125,12 +130,28 @@ class TestEmptyInputs:
         assert statuses[rec_with.id] == ExecutionActionStatus.EXECUTED
         assert statuses[rec_without.id] == ExecutionActionStatus.FAILED
 
+    def test_scores_out_of_order_matched_by_id(self):
+        safe, unsafe = _rec(), _rec()
+        scores = [_score(unsafe.id, safe_to_automate=False), _score(safe.id)]
+        resp = _execute([safe, unsafe], scores, _req(mode=ExecutionMode.SAFE, dry_run=True))
+        assert resp.action_results[0].status == ExecutionActionStatus.DRY_RUN
+        assert resp.action_results[1].status == ExecutionActionStatus.SKIPPED
+
     def test_empty_recs_run_id_propagated(self):
         req = _req(mode=ExecutionMode.DRY_RUN)
         req = ExecuteRequest(run_id="my-special-run", mode=ExecutionMode.DRY_RUN)
         resp = _execute([], [], req)
         assert resp.run_id == "my-special-run"
 
+    def test_empty_recommendations_skip_permission_setup(self, monkeypatch):
+        def fail(self):
+            raise AssertionError("permissions should not be read for an empty request")
+
+        monkeypatch.setattr(ExecutionService, "_granted_permissions", fail)
+        resp = _execute([], [], _req(mode=ExecutionMode.DRY_RUN))
+        assert resp.dry_run is True
+        assert resp.action_results == []
+
 
 # ---------------------------------------------------------------------------
 # ALLOW_DESTRUCTIVE_EXECUTION case sensitivity
@@ -338,8 +359,12 @@ class TestMaxActionsBoundary:
         assert resp.executed == 1
         assert resp.skipped == 2
 
-    def test_max_actions_equals_rec_count_all_execute(self):
-        recs = [_rec() for _ in range(3)]
+    def test_max_actions_equals_rec_count_all_execute(self, s3_mock):
+        # Distinct objects: repeats of one transition are skipped as no-ops.
+        keys = [f"limit/{i}.parquet" for i in range(3)]
+        for key in keys:
+            s3_mock.put_object(Bucket="test-bucket", Key=key, Body=b"x")
+        recs = [_rec(key=key) for key in keys]
         scores = [_score(r.id) for r in recs]
         resp = _execute(recs, scores, _req(mode=ExecutionMode.FULL, dry_run=False, max_actions=3))
         assert resp.executed == 3
@@ -423,6 +448,21 @@ class TestPostChangeStateCompleteness:
         resp = _execute([rec], [score], _req(mode=ExecutionMode.SAFE, dry_run=False))
         assert resp.action_results[0].post_change_state is None
 
+    def test_unvalidated_response_round_trips_through_validation(self, allow_destructive):
+        recs = [
+            _rec(),
+            _rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0),
+            _rec(rec_type=RecommendationType.DELETE_STALE_OBJECT),
+        ]
+        resp = _execute(recs, [_score(recs[0].id), _score(recs[1].id)], _req(mode=ExecutionMode.FULL, dry_run=False))
+        assert ExecuteResponse.model_validate_json(resp.model_dump_json()) == resp
+
+    def test_action_result_is_immutable(self):
+        rec = _rec()
+        resp = _execute([rec], [_score(rec.id)], _req(mode=ExecutionMode.DRY_RUN))
+        with pytest.raises(ValidationError):
+            resp.action_results[0].status = ExecutionActionStatus.EXECUTED
+
 
 # ---------------------------------------------------------------------------
 # eligible counter semantics
@@ -478,6 +518,55 @@ class TestEligibleCounter:
         resp2 = _execute([rec], [score], req)
         assert resp1.execution_id != resp2.execution_id
 
+    def test_audit_ids_unique_within_and_across_calls(self):
+        """audit_id is a per-execution prefix + index, so it never repeats."""
+        recs = [_rec() for _ in range(3)]
+        scores = [_score(r.id) for r in recs]
+        req = _req(mode=ExecutionMode.DRY_RUN, max_actions=2)
+        ids1 = [r.audit_id for r in _execute(recs, scores, req).action_results]
+        ids2 = [r.audit_id for r in _execute(recs, scores, req).action_results]
+        assert len(set(ids1)) == 3
+        assert not set(ids1) & set(ids2)
+
+    def test_repeat_dry_run_reuses_outcomes_with_fresh_ids(self):
+        recs = [_rec() for _ in range(3)]
+        scores = [_score(recs[0].id), _score(recs[1].id, safe_to_automate=False)]
+        req = _req(mode=ExecutionMode.SAFE, dry_run=True)
+        first = _execute(recs, scores, req)
+        second = _execute(recs, scores, req)
+        assert second.execution_id != first.execution_id
+        assert not {r.audit_id for r in first.action_results} & {r.audit_id for r in second.action_results}
+        assert [r.status for r in second.action_results] == [r.status for r in first.action_results]
+        assert second.eligible == first.eligible == 1
+
+    def test_repeat_dry_runs_do_not_share_state_dicts(self):
+        rec = _rec()
+        req = _req(mode=ExecutionMode.FULL, dry_run=True)
+        first = _execute([rec], [_score(rec.id)], req).action_results[0]
+        first.pre_change_state["storage_class"] = "CHANGED"
+        first.post_change_state["target"] = "CHANGED"
+
+        second = _execute([rec], [_score(rec.id)], req).action_results[0]
+        third = _execute([rec], [_score(rec.id)], req).action_results[0]
+
+        assert second.pre_change_state["storage_class"] == "STANDARD"
+        assert second.post_change_state["target"] == "GLACIER_IR"
+        assert second.pre_change_state is not third.pre_change_state
+        assert second.post_change_state is not third.post_change_state
+
+    def test_dry_run_outcome_tracks_permission_changes(self, monkeypatch):
+        rec = _rec()
+        req = _req(mode=ExecutionMode.FULL, dry_run=True)
+        assert _execute([rec], [_score(rec.id)], req).action_results[0].status == ExecutionActionStatus.DRY_RUN
+        monkeypatch.setenv("EXECUTOR_GRANTED_PERMISSIONS", "s3:GetObject")
+        assert _execute([rec], [_score(rec.id)], req).action_results[0].status == ExecutionActionStatus.BLOCKED
+
+    def test_audit_ids_derive_from_execution_id(self):
+        recs = [_rec() for _ in range(2)]
+        resp = _execute(recs, [_score(r.id) for r in recs], _req(mode=ExecutionMode.DRY_RUN))
+        prefix = uuid.UUID(resp.execution_id).hex[:16]
+        assert [r.audit_id for r in resp.action_results] == [f"{prefix}-00000000", f"{prefix}-00000001"]
+
 
 # ---------------------------------------------------------------------------
 # Pre-change state with null-like fields
@@ -510,3 +599,277 @@ class TestPreChangeStateEdges:
         score = _score(rec.id)
         resp = _execute([rec], [score], _req(mode=ExecutionMode.DRY_RUN))
         assert resp.action_results[0].pre_change_state["size_bytes"] == 0
+
+    def test_last_modified_keeps_its_own_offset(self):
+        utc = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        shifted = utc.astimezone(timezone(timedelta(hours=2)))
+        recs = [_rec(last_modified=utc), _rec(last_modified=shifted)]
+        scores = [_score(r.id) for r in recs]
+        resp = _execute(recs, scores, _req(mode=ExecutionMode.DRY_RUN))
+        assert [r.pre_change_state["last_modified"] for r in resp.action_results] == [
+            "2024-01-01T00:00:00+00:00",
+            "2024-01-01T02:00:00+02:00",
+        ]
+
+
+# ---------------------------------------------------------------------------
+# Lifecycle policy prefetch / idempotency
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestLifecyclePrefetch:
+    def test_second_rec_on_same_bucket_sees_merged_rules(self):
+        recs = [_rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0) for _ in range(2)]
+        scores = [_score(r.id) for r in recs]
+        resp = _execute(recs, scores, _req(mode=ExecutionMode.FULL, dry_run=False))
+        first, second = resp.action_results
+        assert first.status == ExecutionActionStatus.EXECUTED
+        assert first.pre_change_state["existing_lifecycle_rules"] is None
+        assert second.status == ExecutionActionStatus.SKIPPED
+        assert "already present" in second.message
+        assert len(second.pre_change_state["existing_lifecycle_rules"]) == 2
+
+    def test_already_present_policy_is_not_rollback_eligible(self):
+        recs = [_rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0) for _ in range(2)]
+        scores = [_score(r.id) for r in recs]
+        resp = _execute(recs, scores, _req(mode=ExecutionMode.FULL, dry_run=False))
+        first, second = resp.action_results
+        assert first.rollback_available
+        assert first.rollback_status == RollbackStatus.PENDING
+        assert not second.rollback_available
+        assert second.rollback_status == RollbackStatus.NOT_APPLICABLE
+        assert (resp.executed, resp.skipped) == (1, 1)
+
+    def test_existing_rules_preserved_on_merge(self, s3_mock):
+        s3_mock.put_bucket_lifecycle_configuration(
+            Bucket="test-bucket",
+            LifecycleConfiguration={"Rules": [
+                {"ID": "user-rule", "Status": "Enabled", "Filter": {"Prefix": "logs/"}, "Expiration": {"Days": 30}},
+            ]},
+        )
+        rec = _rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0)
+        resp = _execute([rec], [_score(rec.id)], _req(mode=ExecutionMode.FULL, dry_run=False))
+        assert resp.action_results[0].status == ExecutionActionStatus.EXECUTED
+        rule_ids = {r["ID"] for r in s3_mock.get_bucket_lifecycle_configuration(Bucket="test-bucket")["Rules"]}
+        assert rule_ids == {"user-rule", "aws-cost-optimizer-archive", "aws-cost-optimizer-multipart-cleanup"}
+
+    def test_missing_bucket_fails_action(self):
+        rec = _rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0)
+        rec = rec.model_copy(update={"bucket": "does-not-exist"})
+        resp = _execute([rec], [_score(rec.id)], _req(mode=ExecutionMode.FULL, dry_run=False))
+        assert resp.action_results[0].status == ExecutionActionStatus.FAILED
+        assert "S3 error" in resp.action_results[0].message
+
+
+# ---------------------------------------------------------------------------
+# Idempotent object actions
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestIdempotentActions:
+    def test_duplicate_transition_in_same_execution_not_reissued(self):
+        recs = [_rec(), _rec()]
+        scores = [_score(r.id) for r in recs]
+        resp = _execute(recs, scores, _req(mode=ExecutionMode.FULL, dry_run=False))
+        first, second = resp.action_results
+        assert first.status == ExecutionActionStatus.EXECUTED
+        assert second.status == ExecutionActionStatus.SKIPPED
+        assert second.message.startswith("Already applied in this execution")
+        assert not second.rollback_available
+        assert second.rollback_status == RollbackStatus.NOT_APPLICABLE
+        assert (resp.executed, resp.skipped) == (1, 1)
+
+    def test_object_already_in_target_class_is_not_copied(self, s3_mock):
+        s3_mock.put_object(Bucket="test-bucket", Key="cold/a.bin", Body=b"x", StorageClass="GLACIER_IR")
+        rec = _rec(key="cold/a.bin")
+        resp = _execute([rec], [_score(rec.id)], _req(mode=ExecutionMode.FULL, dry_run=False))
+        result = resp.action_results[0]
+        assert result.status == ExecutionActionStatus.SKIPPED
+        assert "already in GLACIER_IR" in result.message
+        assert not result.rollback_available
+        assert result.rollback_status == RollbackStatus.NOT_APPLICABLE
+        assert result.post_change_state is None
+        assert (resp.executed, resp.skipped) == (0, 1)
+
+    def test_missing_object_fails_transition(self):
+        rec = _rec(key="does/not/exist")
+        resp = _execute([rec], [_score(rec.id)], _req(mode=ExecutionMode.FULL, dry_run=False))
+        assert resp.action_results[0].status == ExecutionActionStatus.FAILED
+
+
+# ---------------------------------------------------------------------------
+# Concurrent live execution
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestConcurrentExecute:
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_results_keep_recommendation_order(self, s3_mock, monkeypatch, workers):
+        monkeypatch.setenv("EXECUTOR_WORKERS", workers)
+        keys = [f"pool/{i}.parquet" for i in range(6)]
+        for key in keys:
+            s3_mock.put_object(Bucket="test-bucket", Key=key, Body=b"x")
+        recs = [_rec(key=key) for key in keys]
+        scores = [_score(r.id) for r in recs]
+
+        resp = _execute(recs, scores, _req(mode=ExecutionMode.FULL, dry_run=False))
+
+        assert [r.recommendation_id for r in resp.action_results] == [r.id for r in recs]
+        assert resp.executed == 6
+        for key in keys:
+            head = s3_mock.head_object(Bucket="test-bucket", Key=key)
+            assert head["StorageClass"] == "GLACIER_IR"
+
+
+# ---------------------------------------------------------------------------
+# execute_async
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestExecuteAsync:
+    def test_matches_sync_results_in_order(self, s3_mock):
+        keys = [f"async/{i}.parquet" for i in range(5)]
+        for key in keys:
+            s3_mock.put_object(Bucket="test-bucket", Key=key, Body=b"x")
+        recs = [_rec(key=key) for key in keys]
+        recs.append(_rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0))
+        scores = [_score(r.id) for r in recs]
+        req = _req(mode=ExecutionMode.FULL, dry_run=False)
+
+        resp = asyncio.run(svc.execute_async(req, recs, scores, concurrency=2))
+
+        assert [r.recommendation_id for r in resp.action_results] == [r.id for r in recs]
+        assert all(r.status == ExecutionActionStatus.EXECUTED for r in resp.action_results)
+        assert resp.executed == 6
+        assert resp.failed == 0
+
+    def test_same_bucket_lifecycle_actions_run_in_order(self):
+        recs = [_rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0, key=f"k{i}") for i in range(3)]
+        scores = [_score(r.id) for r in recs]
+        resp = asyncio.run(
+            svc.execute_async(_req(mode=ExecutionMode.FULL, dry_run=False), recs, scores)
+        )
+        first, *rest = resp.action_results
+        assert first.pre_change_state["existing_lifecycle_rules"] is None
+        assert all("already present" in r.message for r in rest)
+        assert all(r.status == ExecutionActionStatus.SKIPPED for r in rest)
+
+
+# ---------------------------------------------------------------------------
+# iter_execute (streaming)
+# ---------------------------------------------------------------------------
+
+def _live_recs(s3_mock, count):
+    keys = [f"stream/{i}.parquet" for i in range(count)]
+    for key in keys:
+        s3_mock.put_object(Bucket="test-bucket", Key=key, Body=b"x")
+    return [_rec(key=key) for key in keys]
+
+
+@pytest.mark.unit
+class TestIterExecute:
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_yields_in_order_and_reports_response(self, s3_mock, monkeypatch, workers):
+        monkeypatch.setenv("EXECUTOR_WORKERS", workers)
+        recs = _live_recs(s3_mock, 6)
+        finished = []
+        stream = svc.iter_execute(
+            _req(mode=ExecutionMode.FULL, dry_run=False), recs, [_score(r.id) for r in recs], on_finish=finished.append
+        )
+
+        yielded = list(stream)
+
+        assert [r.recommendation_id for r in yielded] == [r.id for r in recs]
+        assert all(r.status == ExecutionActionStatus.EXECUTED for r in yielded)
+        [resp] = finished
+        assert resp.executed == 6
+        assert resp.action_results == yielded
+
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_closing_early_reports_every_action(self, s3_mock, monkeypatch, workers):
+        monkeypatch.setenv("EXECUTOR_WORKERS", workers)
+        recs = _live_recs(s3_mock, 6)
+        finished = []
+        stream = svc.iter_execute(
+            _req(mode=ExecutionMode.FULL, dry_run=False), recs, [_score(r.id) for r in recs], on_finish=finished.append
+        )
+
+        first = next(stream)
+        stream.close()
+
+        [resp] = finished
+        assert resp.action_results[0] == first
+        assert len(resp.action_results) == 6
+        for result, rec in zip(resp.action_results, recs):
+            head = s3_mock.head_object(Bucket="test-bucket", Key=rec.key)
+            moved = head.get("StorageClass") == "GLACIER_IR"
+            # Every object that was changed is recorded as executed; the rest
+            # were never run.
+            assert (result.status == ExecutionActionStatus.EXECUTED) == moved
+            if not moved:
+                assert result.status == ExecutionActionStatus.SKIPPED
+                assert result.message.startswith("Not run")
+        assert resp.executed + resp.skipped == 6
+        if workers == "1":
+            assert (resp.executed, resp.skipped) == (1, 5)
+
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_action_error_still_reports_response(self, s3_mock, monkeypatch, workers):
+        monkeypatch.setenv("EXECUTOR_WORKERS", workers)
+        recs = _live_recs(s3_mock, 4)
+        service = ExecutionService()
+        run_action = service._run_action
+
+        def flaky(action, plan):
+            if action.index == 2:
+                raise RuntimeError("boom")
+            return run_action(action, plan)
+
+        monkeypatch.setattr(service, "_run_action", flaky)
+        finished = []
+        stream = service.iter_execute(
+            _req(mode=ExecutionMode.FULL, dry_run=False), recs, [_score(r.id) for r in recs], on_finish=finished.append
+        )
+
+        with pytest.raises(RuntimeError, match="boom"):
+            list(stream)
+
+        [resp] = finished
+        assert resp.action_results[2].status == ExecutionActionStatus.SKIPPED
+        assert resp.executed + resp.skipped == 4
+        assert all(r is not None for r in resp.action_results)
+
+
+# ---------------------------------------------------------------------------
+# execute_many
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestExecuteMany:
+    def test_returns_one_response_per_request_in_order(self):
+        batch = []
+        for run_id in ("run-a", "run-b"):
+            recs = [_rec(), _rec()]
+            batch.append((ExecuteRequest(run_id=run_id, mode=ExecutionMode.DRY_RUN), recs, [_score(r.id) for r in recs]))
+
+        responses = svc.execute_many(batch)
+
+        assert [resp.run_id for resp in responses] == ["run-a", "run-b"]
+        for resp, (_, recs, _) in zip(responses, batch):
+            assert [r.recommendation_id for r in resp.action_results] == [r.id for r in recs]
+            assert resp.executed == 2
+        assert responses[0].execution_id != responses[1].execution_id
+
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_later_run_sees_earlier_runs_changes(self, s3_mock, monkeypatch, workers):
+        monkeypatch.setenv("EXECUTOR_WORKERS", workers)
+        first = _rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0)
+        second = _rec(rec_type=RecommendationType.ADD_LIFECYCLE_POLICY, size_bytes=0)
+        req = _req(mode=ExecutionMode.FULL, dry_run=False)
+
+        responses = ExecutionService().execute_many(
+            [(req, [first], [_score(first.id)]), (req, [second], [_score(second.id)])]
+        )
+
+        assert responses[0].action_results[0].pre_change_state["existing_lifecycle_rules"] is None
+        assert "already present" in responses[1].action_results[0].message
@@ -1,9 +1,11 @@
 """Unit tests for ScannerService."""
 
+import asyncio
+
 import pytest
 import boto3
 
-from app.models import RecommendationType, ScanRequest
+from app.models import Recommendation, RecommendationType, ScanRequest
 from app.scanner.service import ScannerService
 
 
@@ -58,6 +60,35 @@ class TestBucketResolution:
         ids = [r.id for r in result]
         assert len(ids) == len(set(ids))
 
+    @pytest.mark.parametrize("workers", ["1", "4"])
+    def test_results_follow_bucket_order(self, svc, s3_mock, monkeypatch, workers):
+        monkeypatch.setenv("SCANNER_WORKERS", workers)
+        for name in ("bucket-a", "bucket-b", "bucket-c"):
+            s3_mock.create_bucket(Bucket=name)
+        order = ["bucket-c", "test-bucket", "bucket-a", "bucket-b"]
+        result = svc.scan(ScanRequest(include_buckets=order))
+        seen = list(dict.fromkeys(r.bucket for r in result))
+        assert seen == order
+
+    def test_iter_scan_streams_same_results_as_scan(self, svc, s3_mock):
+        s3_mock.create_bucket(Bucket="bucket-b")
+        req = ScanRequest(include_buckets=["test-bucket", "bucket-b"])
+        streamed = svc.iter_scan(req)
+        first = next(streamed)
+        rest = list(streamed)
+        assert [(r.bucket, r.recommendation_type) for r in [first, *rest]] == [
+            (r.bucket, r.recommendation_type) for r in svc.scan(req)
+        ]
+
+    def test_scan_async_matches_scan(self, svc, s3_mock):
+        s3_mock.create_bucket(Bucket="bucket-b")
+        req = ScanRequest(include_buckets=["bucket-b", "test-bucket"])
+        sync_result = svc.scan(req)
+        async_result = asyncio.run(svc.scan_async(req, concurrency=1))
+        assert [(r.bucket, r.key, r.recommendation_type) for r in async_result] == [
+            (r.bucket, r.key, r.recommendation_type) for r in sync_result
+        ]
+
 
 # ---------------------------------------------------------------------------
 # Lifecycle policy detection
@@ -88,6 +119,34 @@ class TestLifecycleDetection:
         types = [r.recommendation_type for r in result]
         assert RecommendationType.ADD_LIFECYCLE_POLICY not in types
 
+    def test_lifecycle_probe_is_cached_until_invalidated(self, svc, s3_mock):
+        req = ScanRequest(include_buckets=["test-bucket"])
+        svc.scan(req)
+        s3_mock.put_bucket_lifecycle_configuration(
+            Bucket="test-bucket",
+            LifecycleConfiguration={
+                "Rules": [{
+                    "ID": "added-later",
+                    "Status": "Enabled",
+                    "Filter": {"Prefix": ""},
+                    "Expiration": {"Days": 365},
+                }]
+            },
+        )
+        cached = [r.recommendation_type for r in svc.scan(req)]
+        assert RecommendationType.ADD_LIFECYCLE_POLICY in cached
+
+        svc.invalidate_cache()
+        fresh = [r.recommendation_type for r in svc.scan(req)]
+        assert RecommendationType.ADD_LIFECYCLE_POLICY not in fresh
+
+    def test_bucket_list_is_cached_until_invalidated(self, svc, s3_mock):
+        svc.scan(ScanRequest())
+        s3_mock.create_bucket(Bucket="new-bucket")
+        assert "new-bucket" not in {r.bucket for r in svc.scan(ScanRequest())}
+        svc.invalidate_cache()
+        assert "new-bucket" in {r.bucket for r in svc.scan(ScanRequest())}
+
     def test_lifecycle_recommendation_has_bucket_set_and_no_key(self, svc):
         result = svc.scan(ScanRequest(include_buckets=["test-bucket"]))
         lifecycle_recs = [
@@ -183,6 +242,16 @@ class TestObjectAgeRecommendations:
             if rec.key == "test/key.parquet":
                 assert rec.recommendation_type == RecommendationType.DELETE_STALE_OBJECT
 
+    def test_objects_of_the_same_age_share_one_reason_string(self, svc, s3_mock, monkeypatch):
+        monkeypatch.setattr("app.scanner.service._STALE_DAYS", -1)
+        s3_mock.put_object(Bucket="test-bucket", Key="twin/a.parquet", Body=b"a")
+        s3_mock.put_object(Bucket="test-bucket", Key="twin/b.parquet", Body=b"b")
+        result = svc.scan(ScanRequest(include_buckets=["test-bucket"]))
+        reasons = [r.reason for r in result if r.key and r.key.startswith("twin/")]
+        assert len(reasons) == 2
+        assert reasons[0] == "Object has not been modified in 0 days (0 year(s))."
+        assert reasons[0] is reasons[1]
+
     def test_change_storage_class_only_for_standard_class(self, svc, s3_mock, monkeypatch):
         """Objects already in GLACIER_IR should NOT get a CHANGE_STORAGE_CLASS rec."""
         monkeypatch.setattr("app.scanner.service._COLD_DAYS", -1)
@@ -253,6 +322,36 @@ class TestMultipartUploadDetection:
         types = [r.recommendation_type for r in result]
         assert RecommendationType.DELETE_INCOMPLETE_UPLOAD not in types
 
+    @staticmethod
+    def _abort_rule(s3_mock, **filter_):
+        s3_mock.put_bucket_lifecycle_configuration(
+            Bucket="test-bucket",
+            LifecycleConfiguration={
+                "Rules": [{
+                    "ID": "abort-mpu",
+                    "Status": "Enabled",
+                    "Filter": filter_,
+                    "AbortIncompleteMultipartUpload": {"DaysAfterInitiation": 1},
+                }]
+            },
+        )
+
+    def test_listing_skipped_when_lifecycle_aborts_uploads(self, svc, s3_mock, monkeypatch):
+        """A bucket-wide abort rule already cleans up uploads → no listing call."""
+        self._abort_rule(s3_mock, Prefix="")
+        listed = []
+        monkeypatch.setattr(svc, "_check_multipart_uploads", lambda bucket: listed.append(bucket) or [])
+        svc.scan(ScanRequest(include_buckets=["test-bucket"]))
+        assert listed == []
+
+    def test_listing_kept_when_abort_rule_is_prefixed(self, svc, s3_mock, monkeypatch):
+        """A rule scoped to one prefix leaves uploads elsewhere → still listed."""
+        self._abort_rule(s3_mock, Prefix="tmp/")
+        listed = []
+        monkeypatch.setattr(svc, "_check_multipart_uploads", lambda bucket: listed.append(bucket) or [])
+        svc.scan(ScanRequest(include_buckets=["test-bucket"]))
+        assert listed == ["test-bucket"]
+
 
 # ---------------------------------------------------------------------------
 # Recommendation field validity
@@ -275,6 +374,14 @@ class TestRecommendationFieldValidity:
         for rec in result:
             assert rec.size_bytes >= 0
 
+    def test_unvalidated_recommendations_pass_validation(self, svc, monkeypatch):
+        """Scanner output skips validation; it must still satisfy the contract."""
+        monkeypatch.setattr("app.scanner.service._COLD_DAYS", -1)
+        result = svc.scan(ScanRequest(include_buckets=["test-bucket"]))
+        assert result
+        for rec in result:
+            assert Recommendation.model_validate(rec.model_dump()) == rec
+
     def test_max_objects_per_bucket_limit_respected(self, svc, s3_mock, monkeypatch):
         """max_objects_per_bucket=1 → only 1 object scanned."""
         monkeypatch.setattr("app.scanner.service._COLD_DAYS", -1)
@@ -13,6 +13,9 @@ from app.models import (
     RecommendationType,
     RiskFactorScores,
     RiskLevel,
+    RiskScore,
+    SavingsEstimate,
+    SavingsSummary,
 )
 from app.scoring.service import ScoringService
 
@@ -209,6 +212,34 @@ class TestAgeConfidence:
         rec = _rec(last_modified_days_ago=400)
         assert svc._age_confidence(rec) == 95
 
+    def test_age_is_measured_against_the_given_now(self):
+        rec = _rec(last_modified_days_ago=10)
+        later = datetime.now(timezone.utc) + timedelta(days=400)
+        assert svc._age_confidence(rec, later.timestamp()) == 95
+
+    @pytest.mark.parametrize("offset", [timedelta(days=89, hours=23, minutes=59), timedelta(days=90)])
+    def test_timestamp_ages_match_timedelta_days(self, offset):
+        now = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+        last_modified = (now - offset).astimezone(timezone(timedelta(hours=-7)))
+        rec = _rec(last_modified_days_ago=0).model_copy(update={"last_modified": last_modified})
+        expected = 65 if (now - last_modified).days >= 90 else 45
+        assert svc._age_confidence(rec, now.timestamp()) == expected
+
+    def test_score_reads_the_clock_once_per_batch(self, monkeypatch):
+        import app.scoring.service as scoring_module
+
+        calls = []
+
+        class _Clock(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                calls.append(tz)
+                return datetime.now(tz)
+
+        monkeypatch.setattr(scoring_module, "datetime", _Clock)
+        svc.score([_rec(last_modified_days_ago=days) for days in (10, 100, 400)])
+        assert len(calls) == 1
+
 
 # ---------------------------------------------------------------------------
 # Size impact
@@ -267,6 +298,10 @@ class TestAccessConfidence:
         rec = _rec(last_modified_days_ago=None, reason="Old stale data.")
         assert svc._access_confidence(rec) == 45
 
+    def test_hint_match_is_case_insensitive(self):
+        rec = _rec(last_modified_days_ago=100, reason="Marked STALE by the owner.")
+        assert svc._access_confidence(rec) == 60
+
     def test_access_confidence_capped_at_100(self):
         rec = _rec(last_modified_days_ago=100, reason="Object infrequently cold stale data.")
         assert svc._access_confidence(rec) <= 100
@@ -369,6 +404,23 @@ class TestTargetClassParsing:
     def test_parse_is_case_insensitive(self):
         assert svc._parse_target_class("transition to glacier_ir") == "GLACIER_IR"
 
+    def test_parse_accepts_hyphens(self):
+        assert svc._parse_target_class("Transition to deep-archive") == "DEEP_ARCHIVE"
+
+    def test_parse_is_memoised_per_action(self):
+        from app.scoring.service import _parse_target_class
+
+        _parse_target_class.cache_clear()
+        for _ in range(3):
+            svc._parse_target_class("Transition to GLACIER_IR")
+        info = _parse_target_class.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
+    def test_parse_prefers_the_higher_precedence_class(self):
+        """An action naming several classes resolves the same way the old substring checks did."""
+        assert svc._parse_target_class("Move from GLACIER to DEEP_ARCHIVE") == "DEEP_ARCHIVE"
+        assert svc._parse_target_class("Standard_IA or Intelligent-Tiering") == "INTELLIGENT_TIERING"
+
 
 # ---------------------------------------------------------------------------
 # Savings math: CHANGE_STORAGE_CLASS
@@ -424,6 +476,13 @@ class TestStorageClassSavings:
         assert estimate.minimum_duration_risk == pytest.approx(0.00594, rel=1e-5)
         assert estimate.monthly_savings == pytest.approx(0.02201, rel=1e-5)
 
+    def test_minimum_duration_assumption_only_for_classes_with_one(self):
+        archive = svc._storage_class_savings(_rec(recommended_action="Transition to DEEP_ARCHIVE"))
+        tiering = svc._storage_class_savings(_rec(recommended_action="Use INTELLIGENT_TIERING"))
+        assert "Minimum storage duration 180 days" in archive.assumptions
+        assert not any(a.startswith("Minimum storage duration") for a in tiering.assumptions)
+        assert tiering.minimum_duration_risk == 0.0
+
     def test_confidence_high_with_known_size_and_last_modified(self):
         rec = _rec(size_bytes=GB, last_modified_days_ago=200)
         estimate = svc._storage_class_savings(rec)
@@ -611,7 +670,89 @@ class TestSavingsSummary:
         summary = result.savings_summary
         assert summary.high_confidence_count + summary.medium_confidence_count + summary.low_confidence_count == len(recs)
 
+    def test_every_total_and_count_matches_the_estimates(self):
+        recs = [
+            _rec(rec_type=rec_type, size_bytes=size, last_modified_days_ago=220)
+            for rec_type in RecommendationType
+            for size in (0, GB)
+        ]
+        result = svc.score(recs)
+        details, summary = result.savings_details, result.savings_summary
+        assert summary.total_monthly_savings == pytest.approx(sum(e.monthly_savings for e in details))
+        assert summary.total_annual_savings == pytest.approx(sum(e.net_annual_savings for e in details))
+        assert summary.total_transition_costs == pytest.approx(sum(e.transition_cost for e in details))
+        assert summary.net_first_month == pytest.approx(sum(e.net_first_month for e in details))
+        for level in ("high", "medium", "low"):
+            expected = sum(1 for e in details if e.estimate_confidence == level)
+            assert getattr(summary, f"{level}_confidence_count") == expected
+
     def test_empty_recommendations_returns_zero_summary(self):
         result = svc.score([])
         assert result.savings_summary.total_monthly_savings == 0.0
         assert result.savings_summary.high_confidence_count == 0
+
+
+# ---------------------------------------------------------------------------
+# Unvalidated output still satisfies the contracts
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestOutputContracts:
+    @pytest.mark.parametrize("rec_type", list(RecommendationType))
+    def test_scores_and_estimates_pass_validation(self, rec_type):
+        rec = _rec(rec_type=rec_type, size_bytes=3 * GB, last_modified_days_ago=400)
+        result = svc.score([rec])
+        score, estimate = result.scores[0], result.savings_details[0]
+        assert RiskScore.model_validate(score.model_dump()) == score
+        assert SavingsEstimate.model_validate(estimate.model_dump()) == estimate
+
+    def test_summary_passes_validation(self):
+        recs = [_rec(rec_type=rec_type, size_bytes=GB, last_modified_days_ago=200) for rec_type in RecommendationType]
+        summary = svc.score(recs).savings_summary
+        assert SavingsSummary.model_validate(summary.model_dump()) == summary
+
+
+# ---------------------------------------------------------------------------
+# Batch scoring
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestBatchScoring:
+    def test_batch_matches_scoring_each_recommendation_alone(self):
+        recs = [
+            _rec(rec_type=rec_type, size_bytes=size, last_modified_days_ago=days)
+            for rec_type in RecommendationType
+            for size in (0, GB, 20 * GB)
+            for days in (None, 10, 400)
+        ]
+        batch = svc.score(recs + recs).scores
+        single = [svc.score([rec]).scores[0] for rec in recs]
+        assert batch == single + single
+
+    def test_score_iter_yields_the_same_pairs_as_score(self):
+        recs = [_rec(rec_type=rec_type, last_modified_days_ago=200) for rec_type in RecommendationType]
+        result = svc.score(recs)
+        pairs = list(svc.score_iter(iter(recs)))
+        assert [score for score, _ in pairs] == result.scores
+        assert [savings for _, savings in pairs] == result.savings_details
+
+    def test_score_iter_is_lazy(self):
+        def recs():
+            yield _rec(last_modified_days_ago=200)
+            raise AssertionError("second recommendation should not be pulled yet")
+
+        score, _ = next(svc.score_iter(recs()))
+        assert score.recommendation_id == "rec-test"
+
+    def test_every_recommendation_type_has_a_savings_calculator(self):
+        assert set(ScoringService.SAVINGS_CALCULATORS) == set(RecommendationType)
+        for rec_type, calculator in ScoringService.SAVINGS_CALCULATORS.items():
+            assert callable(calculator)
+            estimate = calculator(svc, _rec(rec_type=rec_type))
+            assert estimate.recommendation_id == "rec-test"
+
+    def test_repeated_factor_combinations_get_separate_factor_lists(self):
+        rec = _rec(last_modified_days_ago=400)
+        first, second = svc.score([rec, rec]).scores
+        assert first.factors == second.factors
+        assert first.factors is not second.factors
@@ -435,6 +435,58 @@ class TestExecutionRecommendationPaths:
         assert result == "Safe to automate."
 
 
+# ---------------------------------------------------------------------------
+# Factor messages — exact thresholds
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestFactorMessageBoundaries:
+    @pytest.mark.parametrize("reversibility,expected", [
+        (49, "Action is irreversible."),
+        (50, "Action is partially reversible."),
+        (79, "Action is partially reversible."),
+        (80, "Action is reversible."),
+    ])
+    def test_reversibility_message(self, reversibility, expected):
+        _, factors = svc._build_factor_scores(reversibility, 0, 0, 0, 0)
+        assert factors[0] == expected
+
+    @pytest.mark.parametrize("data_loss_risk,expected", [
+        (34, "Low data loss risk."),
+        (35, "Moderate data loss risk."),
+        (70, "High data loss risk."),
+    ])
+    def test_data_loss_message(self, data_loss_risk, expected):
+        _, factors = svc._build_factor_scores(100, data_loss_risk, 0, 0, 0)
+        assert factors[1] == expected
+
+    @pytest.mark.parametrize("age_confidence,expected", [
+        (49, "Object age data is weak."),
+        (50, "Object age provides moderate confidence."),
+        (80, "Object age supports high confidence."),
+    ])
+    def test_age_message(self, age_confidence, expected):
+        _, factors = svc._build_factor_scores(100, 0, age_confidence, 0, 0)
+        assert factors[2] == expected
+
+    @pytest.mark.parametrize("size_impact,expected", [
+        (39, "Small data size impact."),
+        (40, "Medium data size impact."),
+        (70, "Large data size increases blast radius."),
+    ])
+    def test_size_message(self, size_impact, expected):
+        _, factors = svc._build_factor_scores(100, 0, 0, size_impact, 0)
+        assert factors[3] == expected
+
+    @pytest.mark.parametrize("access_confidence,expected", [
+        (69, "Access pattern signal is limited."),
+        (70, "Access pattern signal is strong."),
+    ])
+    def test_access_message(self, access_confidence, expected):
+        _, factors = svc._build_factor_scores(100, 0, 0, 0, access_confidence)
+        assert factors[4] == expected
+
+
 # ---------------------------------------------------------------------------
 # score([]) — empty list
 # ---------------------------------------------------------------------------
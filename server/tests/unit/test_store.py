@@ -1,5 +1,6 @@
 """Unit tests for RunStore SQLite persistence."""
 
+import json
 import time
 import uuid
 import pytest
@@ -178,6 +179,17 @@ class TestCreate:
         assert fetched.run_id == created.run_id
         assert fetched.status == RunStatus.SCANNED
 
+    def test_record_is_slotted(self, store):
+        record = store.create([_rec()])
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(AttributeError):
+            record.unknown_field = 1
+
+    def test_create_run_id_is_128_bit_hex(self, store):
+        run_id = store.create([_rec()]).run_id
+        assert len(run_id) == 32
+        int(run_id, 16)
+
     def test_create_assigns_unique_run_ids(self, store):
         ids = [store.create([_rec()]).run_id for _ in range(3)]
         assert len(ids) == len(set(ids))
@@ -193,6 +205,20 @@ class TestCreate:
         assert r.size_bytes == rec.size_bytes
         assert r.storage_class == rec.storage_class
 
+    def test_serialized_payload_matches_model_dump(self, store):
+        recs = [_rec(), _rec_no_key_no_date()]
+        payload = store._serialize_models(recs, Recommendation)
+        assert json.loads(payload) == [r.model_dump(mode="json") for r in recs]
+        summary = _savings_summary()
+        assert json.loads(store._serialize_model(summary)) == summary.model_dump(mode="json")
+
+    def test_deserialize_round_trips_serialized_payload(self, store):
+        recs = [_rec(), _rec_no_key_no_date()]
+        payload = store._serialize_models(recs, Recommendation)
+        assert store._deserialize_models(payload, Recommendation) == recs
+        summary = _savings_summary()
+        assert store._deserialize_model(store._serialize_model(summary), SavingsSummary) == summary
+
 
 # ---------------------------------------------------------------------------
 # get()
@@ -248,6 +274,46 @@ class TestList:
         assert records[0].run_id == second.run_id
         assert records[1].run_id == first.run_id
 
+    def test_iter_runs_matches_list_across_chunks(self, store):
+        for _ in range(5):
+            store.create([_rec()])
+        streamed = [record.run_id for record in store.iter_runs(chunk_size=2)]
+        assert streamed == [record.run_id for record in store.list()]
+
+    def test_iter_runs_is_lazy(self, store):
+        store.create([_rec()])
+        runs = store.iter_runs()
+        assert not isinstance(runs, list)
+        assert next(runs).status == RunStatus.SCANNED
+        assert next(runs, None) is None
+
+    def test_list_summaries_empty_returns_empty_list(self, store):
+        assert store.list_summaries() == []
+
+    def test_list_summaries_sums_recommendations_before_scoring(self, store):
+        created = store.create([_rec(), _rec(), _rec_no_key_no_date()])
+        [summary] = store.list_summaries()
+        assert summary.run_id == created.run_id
+        assert summary.status == RunStatus.SCANNED
+        assert summary.recommendation_count == 3
+        expected = sum(r.estimated_monthly_savings for r in created.recommendations)
+        assert summary.estimated_monthly_savings == pytest.approx(expected)
+        assert summary.updated_at == created.updated_at
+
+    def test_list_summaries_uses_savings_summary_after_scoring(self, store):
+        rec = _rec()
+        created = store.create([rec])
+        store.set_scores(created.run_id, [_risk_score(rec.id)], [_savings_estimate(rec.id)], _savings_summary())
+        [summary] = store.list_summaries()
+        assert summary.status == RunStatus.SCORED
+        assert summary.estimated_monthly_savings == pytest.approx(_savings_summary().total_monthly_savings)
+
+    def test_list_summaries_matches_list_order(self, store):
+        store.create([_rec()])
+        time.sleep(0.01)
+        store.create([])
+        assert [s.run_id for s in store.list_summaries()] == [r.run_id for r in store.list()]
+
 
 # ---------------------------------------------------------------------------
 # set_scores()
@@ -4,6 +4,8 @@ Focus: empty inputs, double-write semantics, combined audit filters,
 rollback timestamp side effects, and updated_at propagation.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+import sqlite3
 import uuid
 import time
 import pytest
@@ -24,7 +26,7 @@ from app.models import (
     SavingsEstimate,
     SavingsSummary,
 )
-from app.state.store import RunStore
+from app.state.store import RunStore, _audit_query
 
 
 # ---------------------------------------------------------------------------
@@ -200,7 +202,7 @@ class TestSetExecutionEdge:
 
     def test_set_execution_twice_stores_second_execution(self, store):
         """Calling set_execution twice: second execution_json overwrites first in runs,
-        but both batches of audit records are inserted (INSERT OR REPLACE by audit_id)."""
+        but both batches of audit records are inserted (distinct audit_ids)."""
         rec = _rec()
         created = store.create([rec])
 
@@ -232,6 +234,31 @@ class TestSetExecutionEdge:
         assert "audit-aaa" in audit_ids
         assert "audit-bbb" in audit_ids
 
+    def test_duplicate_audit_id_rolls_back_the_execution(self, store):
+        rec = _rec()
+        created = store.create([rec])
+        store.set_execution(created.run_id, _execute_response(created.run_id, [_action_result(rec, audit_id="audit-dup")]))
+        first = store.get(created.run_id)
+
+        with pytest.raises(sqlite3.IntegrityError):
+            store.set_execution(
+                created.run_id, _execute_response(created.run_id, [_action_result(rec, audit_id="audit-dup")])
+            )
+
+        assert store.get(created.run_id).execution == first.execution
+        assert len(store.list_execution_audit(created.run_id)) == 1
+
+    def test_audit_rows_written_across_multiple_batches(self, tmp_path):
+        """Executions larger than audit_batch_size are flushed in several batches."""
+        store = RunStore(db_path=str(tmp_path / "batched.db"), audit_batch_size=2)
+        rec = _rec()
+        created = store.create([rec])
+        actions = [_action_result(rec, audit_id=f"audit-{i}") for i in range(5)]
+        store.set_execution(created.run_id, _execute_response(created.run_id, actions))
+
+        audit = store.list_execution_audit(created.run_id)
+        assert {a.audit_id for a in audit} == {f"audit-{i}" for i in range(5)}
+
 
 # ---------------------------------------------------------------------------
 # list_execution_audit() with audit_ids=[] returns all records
@@ -283,6 +310,23 @@ class TestListAuditEdge:
         audit = store.list_execution_audit("ghost-run-id")
         assert audit == []
 
+    def test_audit_ids_filter_beyond_sqlite_variable_limit(self, store):
+        """audit_ids are bound as one JSON array, not one placeholder each."""
+        rec1, rec2 = _rec(), _rec()
+        created = store.create([rec1, rec2])
+        action1 = _action_result(rec1, audit_id="audit-keep")
+        action2 = _action_result(rec2, audit_id="audit-drop")
+        store.set_execution(created.run_id, _execute_response(created.run_id, [action1, action2]))
+
+        audit_ids = [f"audit-ghost-{i}" for i in range(40_000)] + ["audit-keep"]
+        audit = store.list_execution_audit(created.run_id, audit_ids=audit_ids)
+        assert [record.audit_id for record in audit] == ["audit-keep"]
+
+    def test_audit_query_text_does_not_depend_on_id_count(self):
+        assert _audit_query(True, True) is _audit_query(True, True)
+        assert "json_each" in _audit_query(False, True)
+        assert "?,?" not in _audit_query(True, True)
+
 
 # ---------------------------------------------------------------------------
 # update_rollback_status() side effects
@@ -336,3 +380,145 @@ class TestUpdateRollbackStatusEdge:
         updated_audit = store.list_execution_audit(run_id)
         # Message should be unchanged (COALESCE returns old value)
         assert updated_audit[0].message == original_message
+
+
+# ---------------------------------------------------------------------------
+# Mutators return the full record without re-reading it
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestMutatorReturnedRecords:
+    @staticmethod
+    def _assert_same_record(returned, fetched):
+        for field in ("run_id", "status", "recommendations", "scores", "savings_details",
+                      "savings_summary", "execution", "created_at", "updated_at"):
+            assert getattr(returned, field) == getattr(fetched, field), field
+
+    def test_set_scores_returns_what_get_would(self, store):
+        rec = _rec()
+        run_id = store.create([rec]).run_id
+        returned = store.set_scores(run_id, [_risk_score(rec.id)], [], _summary())
+        self._assert_same_record(returned, store.get(run_id))
+
+    def test_set_execution_returns_what_get_would(self, store):
+        rec = _rec()
+        run_id = store.create([rec]).run_id
+        store.set_scores(run_id, [_risk_score(rec.id)], [], _summary())
+        returned = store.set_execution(run_id, _execute_response(run_id, [_action_result(rec)]))
+        self._assert_same_record(returned, store.get(run_id))
+
+    def test_set_execution_on_missing_run_writes_no_audit(self, store):
+        rec = _rec()
+        assert store.set_execution("ghost", _execute_response("ghost", [_action_result(rec)])) is None
+        assert store.list_execution_audit("ghost") == []
+
+    def test_set_execution_stamps_run_and_audit_rows_once(self, store):
+        recs = [_rec(), _rec(), _rec()]
+        run_id = store.create(recs).run_id
+        returned = store.set_execution(
+            run_id, _execute_response(run_id, [_action_result(rec, audit_id=f"a{i}") for i, rec in enumerate(recs)])
+        )
+        audit = store.list_execution_audit(run_id)
+        assert {record.created_at for record in audit} == {returned.updated_at}
+        # Same timestamp, so insertion order decides: newest first.
+        assert [record.audit_id for record in audit] == ["a2", "a1", "a0"]
+
+
+# ---------------------------------------------------------------------------
+# Connection settings
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestConnectionSettings:
+    def test_database_uses_wal_journal(self, store):
+        with store._connect() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_connections_use_normal_sync_and_memory_temp_store(self, store):
+        with store._connect() as conn:
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+    def test_reader_sees_committed_rows_while_writer_is_open(self, store):
+        run_id = store.create([_rec()]).run_id
+        writer = store._open_connection()
+        try:
+            writer.execute("BEGIN IMMEDIATE")
+            writer.execute("UPDATE runs SET status = 'scored' WHERE run_id = ?", (run_id,))
+            assert store.get(run_id).status == RunStatus.SCANNED
+        finally:
+            writer.rollback()
+            writer.close()
+
+    def test_audit_by_run_and_execution_uses_composite_index(self, store):
+        with store._connect() as conn:
+            plan = conn.execute(
+                "EXPLAIN QUERY PLAN " + _audit_query(True, False),
+                ("run", "execution"),
+            ).fetchall()
+        details = " ".join(row["detail"] for row in plan)
+        assert "idx_execution_audit_run_execution" in details
+        assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.unit
+class TestConnectionReuse:
+    def test_same_thread_reuses_its_connection(self, store):
+        assert store._connect() is store._connect()
+
+    def test_each_thread_gets_its_own_connection(self, store):
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            other = pool.submit(store._connect).result()
+        assert other is not store._connect()
+
+    def test_close_drops_the_cached_connection(self, store):
+        first = store._connect()
+        store.close()
+        assert store._connect() is not first
+        assert store.get("missing") is None
+
+    def test_threads_share_one_database(self, store):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            run_ids = list(pool.map(lambda _: store.create([_rec()]).run_id, range(8)))
+        assert {record.run_id for record in store.list()} == set(run_ids)
+
+
+# ---------------------------------------------------------------------------
+# Concurrent writers (serialized by SQLite, not a Python lock)
+# ---------------------------------------------------------------------------
+
+@pytest.mark.unit
+class TestConcurrentWriters:
+    def test_concurrent_mutations_on_different_runs_all_land(self, store):
+        recs = [_rec() for _ in range(8)]
+        run_ids = [store.create([rec]).run_id for rec in recs]
+
+        def score_and_execute(pair):
+            run_id, rec = pair
+            store.set_scores(run_id, [_risk_score(rec.id)], [], _summary())
+            action = _action_result(rec)
+            store.set_execution(run_id, _execute_response(run_id, [action]))
+            return store.update_rollback_status(action.audit_id, RollbackStatus.ROLLED_BACK)
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            assert all(pool.map(score_and_execute, zip(run_ids, recs)))
+
+        for run_id in run_ids:
+            assert store.get(run_id).status == RunStatus.EXECUTED
+            [audit] = store.list_execution_audit(run_id)
+            assert audit.rollback_status == RollbackStatus.ROLLED_BACK
+
+    def test_writer_waits_for_a_held_write_lock(self, store):
+        rec = _rec()
+        run_id = store.create([rec]).run_id
+        holder = store._open_connection()
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pending = pool.submit(store.set_scores, run_id, [_risk_score(rec.id)], [], _summary())
+                time.sleep(0.2)
+                assert not pending.done()
+                holder.rollback()
+                assert pending.result(timeout=5).status == RunStatus.SCORED
+        finally:
+            holder.close()